@@ -80,6 +80,7 @@ class CalendarUISettings:
     import_new_from_google: bool = True
     dialog_width_narrow: int = 460
     dialog_width_wide: int = 680
+    virtual_overscan_rows: int = 2  # строк-часов сверх видимых при виртуализации сетки
 
 
 @dataclass(frozen=True)
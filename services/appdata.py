@@ -19,6 +19,11 @@ try:  # pragma: no cover - optional dependency in tests
 except Exception:  # pragma: no cover
     Credentials = None
 
+try:  # pragma: no cover - optional fast JSON codec
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 _RETRYABLE_STATUS = {429, 500, 502, 503, 504}
 _MAX_RETRIES = 5
@@ -215,8 +220,8 @@ class AppDataClient:
         if not raw:
             return {}, etag
         try:
-            decoded = raw.decode("utf-8")
-            data = json.loads(decoded)
+            # orjson.JSONDecodeError is a subclass of json.JSONDecodeError.
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
             if isinstance(data, dict):
                 return data, etag
         except (UnicodeDecodeError, json.JSONDecodeError):
@@ -279,6 +284,11 @@ class AppDataClient:
 
     @staticmethod
     def _encode_json(payload: Dict[str, Any]) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(
+                payload,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            )
         text = json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True)
         return text.encode("utf-8")
 
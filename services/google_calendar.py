@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import os
+import threading
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, build_http
 from core.settings import GOOGLE_SYNC
 from services.google_sync import event_time_payload
 from utils.datetime_utils import to_rfc3339_utc
@@ -39,7 +41,21 @@ def _path_exists(p) -> bool:
 def _build_service_from_creds(creds) -> Any:
     if creds is None:
         return None
-    return build("calendar", "v3", credentials=creds, cache_discovery=False)
+    from google_auth_httplib2 import AuthorizedHttp
+
+    # httplib2.Http не потокобезопасен, а pull и push идут в разных потоках:
+    # у каждого потока своё авторизованное соединение, общее для всех его запросов
+    local = threading.local()
+
+    def _request_builder(http, *args, **kwargs):
+        authed = getattr(local, "http", None)
+        if authed is None:
+            authed = local.http = AuthorizedHttp(creds, http=build_http())
+        return HttpRequest(authed, *args, **kwargs)
+
+    return build(
+        "calendar", "v3", credentials=creds, cache_discovery=False, requestBuilder=_request_builder
+    )
 
 def _find_creds_in_auth(auth, scopes: Optional[List[str]] = None):
     for name in ("get_credentials", "credentials", "creds"):
@@ -54,17 +54,22 @@ def build_event_payload(task) -> Dict[str, Any]:
     return body
 
 
+def _parse_all_day(value: str) -> Optional[datetime]:
+    # "YYYY-MM-DD" via the C fromisoformat instead of strptime's format parser
+    try:
+        return ensure_utc(datetime.fromisoformat(value))
+    except (TypeError, ValueError):
+        return None
+
+
 def parse_event_datetime(payload: Dict[str, Any]) -> Optional[datetime]:
     if not payload:
         return None
     if "dateTime" in payload:
-        return ensure_utc(parse_rfc3339(payload.get("dateTime")))
+        # parse_rfc3339 already returns aware UTC
+        return parse_rfc3339(payload["dateTime"])
     if "date" in payload:
-        try:
-            raw = datetime.strptime(payload["date"], "%Y-%m-%d")
-        except ValueError:
-            return None
-        return ensure_utc(raw)
+        return _parse_all_day(payload["date"])
     return None
 
 
@@ -80,7 +85,7 @@ def extract_notes(event: Dict[str, Any]) -> str:
 
 
 def event_updated(event: Dict[str, Any]) -> Optional[datetime]:
-    return ensure_utc(parse_rfc3339(event.get("updated")))
+    return parse_rfc3339(event.get("updated"))
 
 
 def task_due_datetime(task) -> Optional[datetime]:
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import json
+import threading
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import Iterable, List, Optional
+from typing import Iterable, List, Optional, Set
 
 from sqlmodel import select
 from sqlalchemy import func
@@ -44,38 +45,74 @@ class PendingOpsQueue:
         # Инъекция фабрики сессий нужна тестам (in-memory SQLite);
         # по умолчанию — рабочая база приложения.
         self._session = session_factory or get_session
+        # ids handed out by due() and not yet removed/requeued/failed: the
+        # worker may already have read the task for them, so they must not
+        # absorb a newer enqueue.
+        self._claimed: Set[int] = set()
+        self._claim_lock = threading.Lock()
+
+    def _release(self, op_id: int) -> None:
+        with self._claim_lock:
+            self._claimed.discard(op_id)
 
     def enqueue(self, op: str, task_id: int, payload: dict) -> None:
         if op not in VALID_OPS:
             raise ValueError(f"Unsupported op: {op}")
-        record = PendingOp(
-            op=op,
-            task_id=task_id,
-            payload=json.dumps(payload, ensure_ascii=False),
-            created_at=utc_now(),
-            next_try_at=utc_now(),
-        )
+        encoded = json.dumps(payload, ensure_ascii=False)
+        with self._claim_lock:
+            claimed = tuple(self._claimed)
         with self._session() as session:
+            # Ops read the task when they run, so an identical op that has not
+            # been attempted yet already covers this one (rapid drags of one
+            # task would otherwise send one patch each, or create twice).
+            # Only unclaimed rows count: one the worker is sending right now
+            # may carry the task as it was before this edit.
+            stmt = select(PendingOp.id).where(
+                PendingOp.op == op,
+                PendingOp.task_id == task_id,
+                PendingOp.payload == encoded,
+                PendingOp.attempts == 0,
+            )
+            if claimed:
+                stmt = stmt.where(PendingOp.id.not_in(claimed))
+            duplicate = session.exec(stmt).first()
+            if duplicate is not None:
+                return
+            record = PendingOp(
+                op=op,
+                task_id=task_id,
+                payload=encoded,
+                created_at=utc_now(),
+                next_try_at=utc_now(),
+            )
             session.add(record)
             session.commit()
 
     def requeue(self, op_id: int, error: str) -> None:
-        with self._session() as session:
-            record = session.get(PendingOp, op_id)
-            if not record:
-                return
-            record.attempts += 1
-            record.last_error = error[:1000]
-            record.next_try_at = _next_try(record.attempts)
-            session.add(record)
-            session.commit()
+        # released only after the commit: until then the row still looks
+        # unattempted and must not absorb a fresh enqueue
+        try:
+            with self._session() as session:
+                record = session.get(PendingOp, op_id)
+                if not record:
+                    return
+                record.attempts += 1
+                record.last_error = error[:1000]
+                record.next_try_at = _next_try(record.attempts)
+                session.add(record)
+                session.commit()
+        finally:
+            self._release(op_id)
 
     def remove(self, op_id: int) -> None:
-        with self._session() as session:
-            record = session.get(PendingOp, op_id)
-            if record:
-                session.delete(record)
-                session.commit()
+        try:
+            with self._session() as session:
+                record = session.get(PendingOp, op_id)
+                if record:
+                    session.delete(record)
+                    session.commit()
+        finally:
+            self._release(op_id)
 
     def mark_failed(self, op_id: int, error: str) -> None:
         """Move the op to the dead-letter table: terminal, never retried.
@@ -83,6 +120,12 @@ class PendingOpsQueue:
         The full op (op, task_id, payload, attempt count, error) is preserved
         for inspection/manual recovery; only the queue row is removed.
         """
+        try:
+            self._move_to_dead_letter(op_id, error)
+        finally:
+            self._release(op_id)
+
+    def _move_to_dead_letter(self, op_id: int, error: str) -> None:
         with self._session() as session:
             record = session.get(PendingOp, op_id)
             if not record:
@@ -111,6 +154,8 @@ class PendingOpsQueue:
                 .limit(limit)
             )
             rows = list(session.exec(stmt))
+        with self._claim_lock:
+            self._claimed.update(row.id for row in rows)
 
         result: List[PendingOperation] = []
         for row in rows:
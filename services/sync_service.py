@@ -1,5 +1,7 @@
 from __future__ import annotations
 import logging
+import threading
+from contextlib import contextmanager
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -94,6 +96,8 @@ class SyncService:
         self.logger = _ensure_logger()
         self._engine_marker: Optional[str] = None
         self._engine_marker_read_at: Optional[datetime] = None
+        # queue ops held back until the current pull batch commits (per thread)
+        self._batch_state = threading.local()
 
     # ------------------------------------------------------------------
     # Google Tasks lane gate ("Planner Inbox" single-writer rule)
@@ -354,9 +358,10 @@ class SyncService:
         changed = False
         while True:
             response = service.events().list(**params).execute()
-            for event in response.get("items", []):
-                if self._apply_calendar_event(event):
-                    changed = True
+            with self._write_batch():
+                for event in response.get("items", []):
+                    if self._apply_calendar_event(event):
+                        changed = True
             if "nextPageToken" in response:
                 params.pop("syncToken", None)
                 params.pop("timeMin", None)
@@ -454,12 +459,13 @@ class SyncService:
 
         changed = False
         latest_remote: Optional[datetime] = updated_min
-        for entry in items:
-            if self._apply_task_entry(entry):
-                changed = True
-            remote_updated = ensure_utc(parse_rfc3339(entry.get("updated")))
-            if remote_updated and (latest_remote is None or remote_updated > latest_remote):
-                latest_remote = remote_updated
+        with self._write_batch():
+            for entry in items:
+                if self._apply_task_entry(entry):
+                    changed = True
+                remote_updated = ensure_utc(parse_rfc3339(entry.get("updated")))
+                if remote_updated and (latest_remote is None or remote_updated > latest_remote):
+                    latest_remote = remote_updated
 
         if latest_remote:
             self.tokens.set_tasks_updated_min(latest_remote)
@@ -527,11 +533,37 @@ class SyncService:
 
     # ------------------------------------------------------------------
     # Queue helpers
+    def _enqueue(self, op: str, task_id: int, payload: dict) -> None:
+        deferred = getattr(self._batch_state, "ops", None)
+        if deferred is not None:
+            # the queue shares the SQLite file; writing it now would wait on
+            # the batch's own write lock
+            deferred.append((op, task_id, payload))
+        else:
+            self.queue.enqueue(op, task_id, payload)
+
+    @contextmanager
+    def _write_batch(self):
+        """One local transaction per pulled page; queue ops go out after commit."""
+        batch = getattr(self.repo, "batch_updates", None)
+        if batch is None or getattr(self._batch_state, "ops", None) is not None:
+            yield
+            return
+        self._batch_state.ops = []
+        try:
+            with batch():
+                yield
+            ops = self._batch_state.ops
+        finally:
+            self._batch_state.ops = None
+        for op in ops:
+            self.queue.enqueue(*op)
+
     def _queue_calendar_sync(self, task: Task) -> None:
         if task.gcal_event_id:
-            self.queue.enqueue("gcal_update", task.id, {"eventId": task.gcal_event_id})
+            self._enqueue("gcal_update", task.id, {"eventId": task.gcal_event_id})
         else:
-            self.queue.enqueue("gcal_create", task.id, {})
+            self._enqueue("gcal_create", task.id, {})
 
     def _queue_tasks_sync(self, task: Optional[Task]) -> None:
         if not task:
@@ -543,13 +575,13 @@ class SyncService:
             )
             return
         if task.gtasks_id:
-            self.queue.enqueue("gtasks_update", task.id, {"taskId": task.gtasks_id})
+            self._enqueue("gtasks_update", task.id, {"taskId": task.gtasks_id})
         else:
-            self.queue.enqueue("gtasks_create", task.id, {})
+            self._enqueue("gtasks_create", task.id, {})
 
     def _ensure_calendar_delete(self, task: Task) -> None:
         if task.gcal_event_id:
-            self.queue.enqueue("gcal_delete", task.id, {"eventId": task.gcal_event_id})
+            self._enqueue("gcal_delete", task.id, {"eventId": task.gcal_event_id})
 
     def _ensure_tasks_delete(self, task: Task) -> None:
         if not task.gtasks_id:
@@ -560,7 +592,7 @@ class SyncService:
                 "Not enqueueing gtasks_delete for task %s: %s", task.id, reason
             )
             return
-        self.queue.enqueue("gtasks_delete", task.id, {"taskId": task.gtasks_id})
+        self._enqueue("gtasks_delete", task.id, {"taskId": task.gtasks_id})
 
     # ------------------------------------------------------------------
     # Push payload helpers
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from utils.datetime_utils import ensure_utc, to_rfc3339_utc, utc_now
 from core.settings import GOOGLE_SYNC
@@ -17,9 +17,31 @@ def _parse_datetime(value: Optional[str]):
 class SyncTokenStorage:
     def __init__(self, path: Path | str | None = None):
         self.path = Path(path or GOOGLE_SYNC.sync_token_path)
+        # last parsed file contents, keyed on (mtime_ns, size); read-only use
+        self._cached: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
 
     # ------------------------------------------------------------------
     # generic helpers
+    def _read(self) -> Dict[str, Any]:
+        """Parsed file for getters; re-read only when the file has changed.
+
+        The settings page asks for every timestamp on each refresh, so
+        without this a single status() parsed the same JSON five times.
+        Callers must not mutate the result — setters use ``_load()``.
+        """
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            self._cached = None
+            return {}
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._cached
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        data = self._load()
+        self._cached = (key, data)
+        return data
+
     def _load(self) -> Dict[str, Any]:
         try:
             data = json.loads(self.path.read_text(encoding="utf-8"))
@@ -36,11 +58,12 @@ class SyncTokenStorage:
     def _save(self, data: Dict[str, Any]) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.path.write_text(json.dumps(data), encoding="utf-8")
+        self._cached = None
 
     # ------------------------------------------------------------------
     # Calendar token helpers
     def get_calendar_token(self) -> Optional[str]:
-        data = self._load()
+        data = self._read()
         calendar = data.get("calendar", {})
         if isinstance(calendar, dict):
             token = calendar.get("syncToken")
@@ -76,7 +99,7 @@ class SyncTokenStorage:
         self._save(data)
 
     def get_calendar_pull_timestamp(self):
-        data = self._load()
+        data = self._read()
         calendar = data.get("calendar", {})
         if isinstance(calendar, dict):
             return _parse_datetime(calendar.get("lastPullAt"))
@@ -85,7 +108,7 @@ class SyncTokenStorage:
     # ------------------------------------------------------------------
     # Tasks helpers
     def get_tasks_updated_min(self):
-        data = self._load()
+        data = self._read()
         tasks = data.get("tasks", {})
         if isinstance(tasks, dict):
             value = tasks.get("updatedMin")
@@ -107,7 +130,7 @@ class SyncTokenStorage:
         self._save(data)
 
     def get_tasks_pull_timestamp(self):
-        data = self._load()
+        data = self._read()
         tasks = data.get("tasks", {})
         if isinstance(tasks, dict):
             return _parse_datetime(tasks.get("lastPullAt"))
@@ -121,13 +144,14 @@ class SyncTokenStorage:
         self._save(data)
 
     def get_last_push_timestamp(self):
-        data = self._load()
+        data = self._read()
         return _parse_datetime(data.get("lastPushAt"))
 
     # ------------------------------------------------------------------
     def clear_all(self) -> None:
         if self.path.exists():
             self.path.unlink()
+        self._cached = None
 
 
 __all__ = ["SyncTokenStorage"]
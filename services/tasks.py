@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import json
 import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 from typing import Iterable, List, Optional
 
@@ -12,7 +14,11 @@ from sqlalchemy import and_, or_, case
 from storage.db import get_session
 from models.task import Task
 from core.priorities import normalize_priority
-from utils.datetime_utils import ensure_utc, utc_now
+from utils.datetime_utils import ensure_utc, midnight_utc, utc_now
+
+
+# per-thread session of an open batch_updates() block
+_batch = threading.local()
 
 
 class TaskService:
@@ -21,6 +27,58 @@ class TaskService:
         "after_update": set(),
         "after_delete": set(),
     }
+    # bumped on every local write; lets views skip rebuilding unchanged data
+    _revision = 0
+    # touch() runs from UI handlers and sync worker threads alike
+    _revision_lock = threading.Lock()
+
+    @classmethod
+    def revision(cls) -> int:
+        return cls._revision
+
+    @classmethod
+    def touch(cls) -> None:
+        """Mark task data as changed (also for writers that bypass this service)."""
+        with cls._revision_lock:
+            cls._revision += 1
+
+    @contextmanager
+    def batch_updates(self):
+        """Run this thread's sync-path reads/writes in one transaction.
+
+        get/get_by_*/create_from_sync/update_from_sync/delete share one session
+        and only flush; everything is committed once when the block exits and
+        rolled back if it raises. Nested blocks join the outer one.
+        """
+        if getattr(_batch, "session", None) is not None:
+            yield
+            return
+        with get_session() as s:
+            # objects handed out inside the batch stay readable after commit
+            s.expire_on_commit = False
+            _batch.session = s
+            try:
+                yield
+                s.commit()
+            finally:
+                _batch.session = None
+        self.touch()
+
+    @contextmanager
+    def _session(self):
+        s = getattr(_batch, "session", None)
+        if s is not None:
+            yield s
+            return
+        with get_session() as s:
+            yield s
+
+    @staticmethod
+    def _commit(s) -> None:
+        if s is getattr(_batch, "session", None):
+            s.flush()
+        else:
+            s.commit()
 
     @classmethod
     def subscribe(cls, event: str, callback):
@@ -64,6 +122,7 @@ class TaskService:
             s.add(t)
             s.commit()
             s.refresh(t)
+            self.touch()
             if emit:
                 try:
                     self._emit("after_create", t.id)
@@ -72,7 +131,7 @@ class TaskService:
             return t
 
     def get(self, task_id: int) -> Optional[Task]:
-        with get_session() as s:
+        with self._session() as s:
             return s.get(Task, task_id)
 
     def update(
@@ -104,6 +163,7 @@ class TaskService:
             s.add(t)
             s.commit()
             s.refresh(t)
+            self.touch()
             if emit:
                 try:
                     self._emit("after_update", t.id)
@@ -119,6 +179,7 @@ class TaskService:
                 t.updated_at = utc_now()
                 s.add(t)
                 s.commit()
+                self.touch()
 
     def set_status(self, task_id: int, status: str):
         with get_session() as s:
@@ -128,9 +189,10 @@ class TaskService:
                 t.updated_at = utc_now()
                 s.add(t)
                 s.commit()
+                self.touch()
 
     def delete(self, task_id: int, *, emit: bool = True):
-        with get_session() as s:
+        with self._session() as s:
             t = s.get(Task, task_id)
             if t:
                 if emit:
@@ -139,10 +201,11 @@ class TaskService:
                     except Exception:
                         pass
                 s.delete(t)
-                s.commit()
+                self._commit(s)
+                self.touch()
 
     def list_for_day(self, d: date) -> Iterable[Task]:
-        start = datetime(d.year, d.month, d.day, 0, 0, 0)
+        start = midnight_utc(d)
         end = start + timedelta(days=1)
         with get_session() as s:
             stmt = (
@@ -152,6 +215,19 @@ class TaskService:
             )
             return list(s.exec(stmt))
 
+    def list_range(self, start_day: date, end_day: date) -> Iterable[Task]:
+        """Open tasks starting on any day in [start_day, end_day] — one query for a whole week."""
+        # bounds are aware like the stored starts (see ensure_utc in create)
+        start = midnight_utc(start_day)
+        end = midnight_utc(end_day) + timedelta(days=1)
+        with get_session() as s:
+            stmt = (
+                select(Task)
+                .where(and_(Task.status != "done", Task.start >= start, Task.start < end))
+                .order_by(Task.start.asc(), Task.priority.desc(), Task.created_at.desc())
+            )
+            return list(s.exec(stmt))
+
     def list_unscheduled(self) -> Iterable[Task]:
         with get_session() as s:
             status_order = case(
@@ -179,14 +255,14 @@ class TaskService:
     def get_by_event_id(self, gcal_event_id: str | None):
         if not gcal_event_id:
             return None
-        with get_session() as s:
+        with self._session() as s:
             stmt = select(Task).where(Task.gcal_event_id == gcal_event_id)
             return s.exec(stmt).first()
 
     def get_by_gtasks_id(self, gtasks_id: str | None):
         if not gtasks_id:
             return None
-        with get_session() as s:
+        with self._session() as s:
             stmt = select(Task).where(Task.gtasks_id == gtasks_id)
             return s.exec(stmt).first()
 
@@ -206,7 +282,7 @@ class TaskService:
         gtasks_id: Optional[str] = None,
         gtasks_updated: Optional[datetime] = None,
     ) -> Task:
-        with get_session() as s:
+        with self._session() as s:
             task = Task(
                 title=title.strip() or "Задача",
                 notes=notes or None,
@@ -224,8 +300,9 @@ class TaskService:
             if task.start is None:
                 task.duration_minutes = None
             s.add(task)
-            s.commit()
+            self._commit(s)
             s.refresh(task)
+            self.touch()
             return task
 
     def update_from_sync(
@@ -235,7 +312,7 @@ class TaskService:
         updated_at: Optional[datetime] = None,
         **fields,
     ) -> Optional[Task]:
-        with get_session() as s:
+        with self._session() as s:
             task = s.get(Task, task_id)
             if not task:
                 return None
@@ -250,8 +327,9 @@ class TaskService:
             else:
                 task.updated_at = utc_now()
             s.add(task)
-            s.commit()
+            self._commit(s)
             s.refresh(task)
+            self.touch()
             return task
 
     def delete_from_sync(self, task_id: int) -> None:
@@ -270,6 +348,7 @@ class TaskService:
             s.add(t)
             s.commit()
             s.refresh(t)
+            self.touch()
             return t
 
     # ---------- History & search ----------
@@ -284,8 +363,9 @@ class TaskService:
     ) -> List[Task]:
         """Return tasks filtered by the provided parameters.
 
-        The text search is performed in Python so we can support
-        transliteration-aware matching (Cyrillic/Latin/translit).
+        Date, status and priority filters run in SQL. The text search is
+        performed in Python so we can support transliteration-aware
+        matching (Cyrillic/Latin/translit), which ``LIKE`` cannot express.
         """
 
         with get_session() as s:
@@ -326,7 +406,10 @@ class TaskService:
         if not query or not query.strip():
             return tasks
 
-        return [t for t in tasks if self._match_query(query, f"{t.title} {t.notes or ''}")]
+        token_variants = self._query_variants(query)
+        if not token_variants:
+            return tasks
+        return [t for t in tasks if self._match_variants(token_variants, f"{t.title} {t.notes or ''}")]
 
     # ---------- Metadata helpers ----------
     def clean_notes_metadata(self) -> int:
@@ -346,6 +429,7 @@ class TaskService:
                     changed += 1
             if changed:
                 s.commit()
+                self.touch()
         return changed
 
     def _strip_metadata(self, notes: str) -> str:
@@ -480,17 +564,28 @@ class TaskService:
             variants.add(lat_to_ru)
         return list(variants)
 
-    def _match_query(self, query: str, haystack: str) -> bool:
+    def _query_variants(self, query: str) -> List[List[str]]:
+        """Spelling variants per query token, computed once per search."""
         tokens = [tok for tok in self._RE_SPACES.split(self._normalize_base(query)) if tok]
-        if not tokens:
-            return True
-        haystack_variants = self._variants(haystack)
-        for token in tokens:
-            token_variants = self._variants(token)
-            if not any(tv and tv in hv for hv in haystack_variants for tv in token_variants):
+        return [[tv for tv in self._variants(token) if tv] for token in tokens]
+
+    def _match_variants(self, token_variants: List[List[str]], haystack: str) -> bool:
+        # Most hits are in the text as typed; transliterate the haystack
+        # only when a token is not found there.
+        base = self._normalize_base(haystack)
+        haystack_variants: Optional[List[str]] = None
+        for variants in token_variants:
+            if any(tv in base for tv in variants):
+                continue
+            if haystack_variants is None:
+                haystack_variants = self._variants(haystack)
+            if not any(tv in hv for hv in haystack_variants for tv in variants):
                 return False
         return True
 
+    def _match_query(self, query: str, haystack: str) -> bool:
+        return self._match_variants(self._query_variants(query), haystack)
+
     def _translit_ru_to_lat(self, text: str) -> str:
         return "".join(self._RU_TO_LAT.get(ch, ch) for ch in text)
 
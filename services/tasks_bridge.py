@@ -163,6 +163,9 @@ class GoogleTasksBridge:
         being silently dropped, so the sync engine can propagate deletions;
         hidden (completed) tasks are included so their absence is never
         mistaken for a deletion.
+
+        Both metadata keys reference the same freshly parsed dict; callers
+        treat the result as read-only.
         """
         self._maybe_build_service(strict=True)
         page_token = None
@@ -199,8 +202,8 @@ class GoogleTasksBridge:
                     "id": item.get("id"),
                     "title": item.get("title") or "",
                     "notes": body,
-                    "metadata": dict(meta_from_notes),
-                    "detected_meta": dict(meta_from_notes),
+                    "metadata": meta_from_notes,
+                    "detected_meta": meta_from_notes,
                     "updated": item.get("updated"),
                     "status": item.get("status"),
                     "deleted": deleted,
@@ -650,9 +650,16 @@ class UndatedTasksSync:
             tasks: Iterable[Task] = session.exec(
                 select(Task).where(Task.start == None)  # noqa: E711
             ).all()
+            # One SELECT for every mapping instead of a session.get per task;
+            # touched rows are staged together and committed once below.
+            existing_mappings = {
+                mapping.task_id: mapping
+                for mapping in session.exec(select(SyncMapUndated)).all()
+            }
+            touched: list[SyncMapUndated] = []
 
             for task in tasks:
-                mapping = session.get(SyncMapUndated, str(task.id))
+                mapping = existing_mappings.get(str(task.id))
                 if mapping is None:
                     mapping = SyncMapUndated(
                         task_id=str(task.id),
@@ -705,7 +712,7 @@ class UndatedTasksSync:
                 mapping.gtask_id = gtask_id
                 mapping.dirty_flag = 0
                 mapping.updated_at_utc = _utcnow()
-                session.add(mapping)
+                touched.append(mapping)
 
                 entry = self._ensure_index_entry(gtask_id, allow_create=True)
                 self._write_live_entry(entry, task)
@@ -713,6 +720,7 @@ class UndatedTasksSync:
                 self._index_dirty = True
                 changed = True
 
+            session.add_all(touched)
             session.commit()
 
         self._persist_index_if_dirty()
@@ -1,19 +1,22 @@
 """Utilities for SQLite backups."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import os
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from shutil import copy2
 from typing import Optional
 
 
-def _parse_backup_date(path: Path, prefix: str) -> datetime | None:
-    stem = path.stem
-    if not stem.startswith(prefix):
+def _parse_backup_date(name: str, prefix: str, suffix: str) -> date | None:
+    if not (name.startswith(prefix) and name.endswith(suffix)):
+        return None
+    date_part = name[len(prefix) : len(name) - len(suffix)]
+    # Strict YYYY-MM-DD only: fromisoformat also accepts other ISO forms.
+    if len(date_part) != 10:
         return None
-    date_part = stem[len(prefix) :]
     try:
-        return datetime.strptime(date_part, "%Y-%m-%d")
+        return date.fromisoformat(date_part)
     except ValueError:
         return None
 
@@ -44,14 +47,19 @@ def ensure_daily_backup(
         created_path = destination
 
     if keep_days > 0:
-        cutoff = today - timedelta(days=keep_days - 1)
-        for file in backups.glob(f"{db_file.stem}_*{db_file.suffix}"):
-            backup_date = _parse_backup_date(file, prefix)
-            if backup_date and backup_date.date() < cutoff:
-                try:
-                    file.unlink()
-                except OSError:
-                    pass
+        cutoff = (today - timedelta(days=keep_days - 1)).toordinal()
+        with os.scandir(backups) as entries:
+            stale = [
+                entry.path
+                for entry in entries
+                if (backup_date := _parse_backup_date(entry.name, prefix, db_file.suffix))
+                and backup_date.toordinal() < cutoff
+            ]
+        for path in stale:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
 
     return created_path
 
@@ -47,6 +47,12 @@ def ensure_task_columns(conn) -> None:
         )
 
 
+def ensure_task_indexes(conn) -> None:
+    # history search filters by date range, status and priority
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_task_start ON task(start)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_task_status_priority ON task(status, priority)"))
+
+
 def ensure_pending_ops_table(conn) -> None:
     conn.execute(
         text(
@@ -163,6 +169,7 @@ def run_all(engine) -> None:
     with engine.begin() as conn:
         ensure_task_columns(conn)
         ensure_task_uid(conn)
+        ensure_task_indexes(conn)
         ensure_daily_task_columns(conn)
         ensure_tag_tables(conn)
         ensure_sync_map_undated_columns(conn)
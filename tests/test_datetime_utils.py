@@ -39,3 +39,12 @@ def test_snap_minutes_rounding():
     assert snap_minutes(17, step=15, direction="nearest") == 15
     assert snap_minutes(8, step=15, direction="forward") == 15
     assert snap_minutes(22, step=15, direction="backward") == 15
+
+
+def test_parse_rfc3339_zulu_offsets_and_odd_fractions():
+    from utils.datetime_utils import parse_rfc3339
+
+    assert parse_rfc3339("2026-03-02T10:00:00Z").isoformat() == "2026-03-02T10:00:00+00:00"
+    assert parse_rfc3339("2026-03-02T10:00:00.5-05:00").isoformat() == "2026-03-02T15:00:00.500000+00:00"
+    assert parse_rfc3339("2026-03-02T10:00:00.1234567+03:00").isoformat() == "2026-03-02T07:00:00.123456+00:00"
+    assert parse_rfc3339("not a date") is None
@@ -11,6 +11,9 @@ Covers the retry/terminal split:
 * one terminal failure does not stop the rest of the batch;
 * lane-blocked gtasks_* ops in undated mode are still requeued (rollback
   safety), never dead-lettered.
+* an identical op that has not been attempted yet absorbs a repeat
+  enqueue (rapid edits of one task send one request), unless the worker
+  has already claimed it — then the new edit is queued on its own.
 
 Everything runs against fakes and in-memory SQLite; no real Google APIs.
 """
@@ -324,3 +327,50 @@ def test_mark_failed_moves_row_to_dead_letter_table():
     # Unknown ids are a no-op, not an error.
     queue.mark_failed(9999, "whatever")
     assert queue.failed_count() == 1
+
+
+def test_identical_unattempted_op_is_not_enqueued_twice():
+    queue = _make_queue()
+
+    queue.enqueue("gcal_update", 7, {"eventId": "ev-7"})
+    queue.enqueue("gcal_update", 7, {"eventId": "ev-7"})
+    queue.enqueue("gcal_update", 8, {"eventId": "ev-8"})
+
+    assert [(r.op, r.task_id) for r in _rows(queue, PendingOp)] == [
+        ("gcal_update", 7),
+        ("gcal_update", 8),
+    ]
+
+
+def test_retried_op_does_not_swallow_a_fresh_enqueue():
+    queue = _make_queue()
+    queue.enqueue("gcal_update", 7, {"eventId": "ev-7"})
+    (first,) = queue.due()
+    queue.requeue(first.id, "HTTP 503")
+
+    queue.enqueue("gcal_update", 7, {"eventId": "ev-7"})
+
+    rows = _rows(queue, PendingOp)
+    assert sorted(r.attempts for r in rows) == [0, 1]
+
+
+def test_enqueue_during_send_is_kept_for_the_next_run(tmp_path, monkeypatch):
+    queue = _make_queue()
+    repo = FakeRepo()
+    repo.add(_scheduled_task(2, gcal_event_id="ev-2"))
+    service = _make_service(tmp_path, gcal=_flaky_gcal(), repo=repo, queue=queue)
+    queue.enqueue("gcal_update", 2, {"eventId": "ev-2"})
+
+    execute = service._execute_op
+
+    def edit_while_sending(entry):
+        # the op has already read the task; a second drag lands now
+        result = execute(entry)
+        queue.enqueue("gcal_update", 2, {"eventId": "ev-2"})
+        return result
+
+    monkeypatch.setattr(service, "_execute_op", edit_while_sending)
+
+    assert service.push_queue_worker() == 1
+    rows = _rows(queue, PendingOp)
+    assert [(r.op, r.task_id, r.attempts) for r in rows] == [("gcal_update", 2, 0)]
@@ -0,0 +1,38 @@
+"""Token file reads are shared between getters until the file changes."""
+import json
+from datetime import datetime, timezone
+
+from services.sync_token_storage import SyncTokenStorage
+
+UTC = timezone.utc
+
+
+def test_getters_parse_file_once_until_it_changes(tmp_path, monkeypatch):
+    storage = SyncTokenStorage(tmp_path / "tokens.json")
+    storage.set_calendar_token("tok-1")
+    storage.set_last_push_timestamp(datetime(2026, 7, 1, 9, tzinfo=UTC))
+
+    loads = []
+    real_loads = json.loads
+    monkeypatch.setattr(json, "loads", lambda text: loads.append(1) or real_loads(text))
+
+    assert storage.get_calendar_token() == "tok-1"
+    assert storage.get_last_push_timestamp() == datetime(2026, 7, 1, 9, tzinfo=UTC)
+    assert storage.get_calendar_pull_timestamp() is None
+    assert len(loads) == 1
+
+    storage.set_calendar_token("tok-2")
+    assert storage.get_calendar_token() == "tok-2"
+
+
+def test_external_rewrite_is_picked_up(tmp_path):
+    path = tmp_path / "tokens.json"
+    storage = SyncTokenStorage(path)
+    storage.set_calendar_token("tok-1")
+    assert storage.get_calendar_token() == "tok-1"
+
+    path.write_text(json.dumps({"calendar": {"syncToken": "other-process"}}), encoding="utf-8")
+    assert storage.get_calendar_token() == "other-process"
+
+    storage.clear_all()
+    assert storage.get_calendar_token() is None
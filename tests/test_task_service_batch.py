@@ -0,0 +1,108 @@
+"""Calendar pull writes one local transaction per page of events.
+
+``TaskService.batch_updates()`` lets the sync-path reads/writes of a thread
+share one session and commit once; ``SyncService`` wraps every pulled page
+in it and holds pending-op enqueues back until that commit, because the
+queue lives in the same SQLite file and would otherwise wait on the batch's
+own write lock.
+
+Runs against a temporary SQLite file and a fake Google Calendar.
+"""
+from datetime import datetime, timezone
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine, select
+
+import services.tasks as tasks_module
+from models.pending_op import PendingOp
+from models.task import Task
+from services.pending_ops_queue import PendingOpsQueue
+from services.sync_service import SyncService
+from services.sync_token_storage import SyncTokenStorage
+from services.tasks import TaskService
+
+from test_sync_engine_wiring import FakeGoogleCalendar, FakeGoogleTasks
+
+UTC = timezone.utc
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{(tmp_path / 'planner.db').as_posix()}")
+    SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(tasks_module, "get_session", lambda: Session(engine))
+    return engine
+
+
+def _event(event_id, updated="2026-07-01T00:00:00Z"):
+    return {
+        "id": event_id,
+        "status": "confirmed",
+        "summary": event_id,
+        "etag": f"etag-{event_id}",
+        "updated": updated,
+        "start": {"dateTime": "2026-07-06T09:00:00Z"},
+        "end": {"dateTime": "2026-07-06T10:00:00Z"},
+    }
+
+
+def _service(tmp_path, engine, *events):
+    gcal = FakeGoogleCalendar(list_payloads=[{"items": list(events), "nextSyncToken": "tok-1"}])
+    queue = PendingOpsQueue(session_factory=lambda: Session(engine))
+    service = SyncService(
+        gcal,
+        FakeGoogleTasks(),
+        TaskService(),
+        SyncTokenStorage(tmp_path / "tokens.json"),
+        queue,
+    )
+    return service
+
+
+def _titles(engine):
+    with Session(engine) as session:
+        return sorted(t.title for t in session.exec(select(Task)))
+
+
+def test_page_is_committed_once_and_queue_ops_follow_commit(tmp_path, engine):
+    repo = TaskService()
+    local = repo.create_from_sync(
+        title="local",
+        start=datetime(2026, 7, 6, 9, tzinfo=UTC),
+        duration_minutes=60,
+        gcal_event_id="ev-local",
+        gcal_updated=datetime(2026, 6, 1, tzinfo=UTC),
+    )
+    service = _service(tmp_path, engine, _event("ev-new"), _event("ev-local"))
+    revision = TaskService.revision()
+
+    assert service._pull_calendar() is True
+
+    assert _titles(engine) == ["ev-new", "local"]
+    with Session(engine) as session:
+        ops = [(op.op, op.task_id) for op in session.exec(select(PendingOp))]
+    # the local task is newer, so it is queued for push — after the commit
+    assert ops == [("gcal_update", local.id)]
+    assert TaskService.revision() > revision
+
+
+def test_failed_page_rolls_back_and_drops_queued_ops(tmp_path, engine, monkeypatch):
+    service = _service(tmp_path, engine, _event("ev-1"), _event("ev-2"))
+    apply = service._apply_calendar_event
+    calls = []
+
+    def flaky(event):
+        calls.append(event["id"])
+        if len(calls) == 2:
+            raise RuntimeError("boom")
+        service._enqueue("gcal_create", 1, {})
+        return apply(event)
+
+    monkeypatch.setattr(service, "_apply_calendar_event", flaky)
+
+    with pytest.raises(RuntimeError):
+        service._pull_calendar()
+
+    assert _titles(engine) == []
+    with Session(engine) as session:
+        assert list(session.exec(select(PendingOp))) == []
@@ -0,0 +1,135 @@
+"""Read paths of ``TaskService`` used by the history and calendar pages.
+
+``search_history`` matches every query token against the title and notes
+as typed first and transliterates only on a miss; ``list_range`` loads a
+whole week in one query with ``list_for_day``'s ordering. ``run_all``
+adds the indexes these queries rely on to legacy databases.
+
+Runs against a temporary SQLite file.
+"""
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import SQLModel, Session, create_engine
+
+import services.tasks as tasks_module
+from models.task import Task
+from services.tasks import TaskService
+from storage import migrations
+
+UTC = timezone.utc
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{(tmp_path / 'planner.db').as_posix()}")
+    SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(tasks_module, "get_session", lambda: Session(engine))
+    return engine
+
+
+def _add(engine, **fields):
+    with Session(engine) as session:
+        task = Task(**fields)
+        session.add(task)
+        session.commit()
+        session.refresh(task)
+        return task
+
+
+def _search(query):
+    return sorted(t.title for t in TaskService().search_history(query=query))
+
+
+# ---- search_history ---------------------------------------------------------
+
+def test_search_matches_across_latin_and_cyrillic(engine):
+    _add(engine, title="Купить молоко")
+    _add(engine, title="Call Masha", notes="про отпуск")
+    _add(engine, title="Отчёт")
+
+    assert _search("moloko") == ["Купить молоко"]
+    assert _search("маша") == ["Call Masha"]
+    # notes are part of the haystack too
+    assert _search("otpusk") == ["Call Masha"]
+
+
+def test_search_requires_every_token(engine):
+    _add(engine, title="Купить молоко")
+    _add(engine, title="Купить хлеб")
+
+    assert _search("купить") == ["Купить молоко", "Купить хлеб"]
+    assert _search("kupit moloko") == ["Купить молоко"]
+    assert _search("молоко хлеб") == []
+
+
+def test_empty_query_returns_everything(engine):
+    _add(engine, title="a")
+    _add(engine, title="b")
+
+    assert _search("") == ["a", "b"]
+    assert _search("   ") == ["a", "b"]
+
+
+def test_search_treats_yo_as_ye(engine):
+    _add(engine, title="Отчёт за июль")
+    _add(engine, title="Елка")
+
+    assert _search("отчет") == ["Отчёт за июль"]
+    assert _search("ёлка") == ["Елка"]
+
+
+# ---- list_range -------------------------------------------------------------
+
+def test_list_range_includes_end_day_and_skips_done(engine):
+    _add(engine, title="before", start=datetime(2026, 7, 5, 23, 0, tzinfo=UTC))
+    _add(engine, title="monday", start=datetime(2026, 7, 6, 9, 0, tzinfo=UTC))
+    _add(engine, title="sunday late", start=datetime(2026, 7, 12, 23, 30, tzinfo=UTC))
+    _add(engine, title="after", start=datetime(2026, 7, 13, 0, 0, tzinfo=UTC))
+    _add(engine, title="done", start=datetime(2026, 7, 8, 9, 0, tzinfo=UTC), status="done")
+    _add(engine, title="undated")
+
+    titles = [t.title for t in TaskService().list_range(date(2026, 7, 6), date(2026, 7, 12))]
+
+    assert titles == ["monday", "sunday late"]
+
+
+def test_list_range_orders_like_list_for_day(engine):
+    day = date(2026, 7, 6)
+    _add(engine, title="late", start=datetime(2026, 7, 6, 15, 0, tzinfo=UTC), priority=3)
+    _add(engine, title="low", start=datetime(2026, 7, 6, 9, 0, tzinfo=UTC), priority=0)
+    _add(engine, title="high older", start=datetime(2026, 7, 6, 9, 0, tzinfo=UTC), priority=2,
+         created_at=datetime(2026, 7, 1, tzinfo=UTC))
+    _add(engine, title="high newer", start=datetime(2026, 7, 6, 9, 0, tzinfo=UTC), priority=2,
+         created_at=datetime(2026, 7, 2, tzinfo=UTC))
+
+    service = TaskService()
+    by_range = [t.title for t in service.list_range(day, day)]
+
+    # start, then priority desc, then newest first
+    assert by_range == ["high newer", "high older", "low", "late"]
+    assert by_range == [t.title for t in service.list_for_day(day)]
+
+
+# ---- migrations -------------------------------------------------------------
+
+def test_run_all_adds_task_indexes_to_legacy_db(tmp_path):
+    engine = create_engine(f"sqlite:///{(tmp_path / 'legacy.db').as_posix()}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE task (id INTEGER PRIMARY KEY, title TEXT, start TEXT,"
+            " priority INTEGER, status TEXT)"
+        ))
+        conn.execute(text("CREATE TABLE dailytask (id TEXT PRIMARY KEY, title TEXT)"))
+
+    migrations.run_all(engine)
+
+    with engine.begin() as conn:
+        names = {
+            row[0]
+            for row in conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='task'")
+            )
+        }
+    assert {"ix_task_start", "ix_task_status_priority"} <= names
@@ -86,11 +86,13 @@ class FakeBridge:
         return "list-1"
 
     def fetch_all(self, tasklist_id):
+        # The sync engine never mutates fetched items, so hand out the stored
+        # dicts; only the list itself is fresh (pull may delete while iterating).
         self.fetch_calls += 1
-        return [dict(item) for item in self.tasks.values()]
+        return list(self.tasks.values())
 
     def upsert_task(self, tasklist_id, local_task):
-        self.inserted.append((tasklist_id, dict(local_task)))
+        self.inserted.append((tasklist_id, local_task))
         gtask_id = local_task.get("gtask_id") or f"gtask-{len(self.inserted)}"
         self.tasks[gtask_id] = {
             "id": gtask_id,
@@ -109,10 +109,12 @@ class FakeBridge:
         return "list-1"
 
     def fetch_all(self, tasklist_id):
-        return [dict(item) for item in self.tasks.values()]
+        # The sync engine never mutates fetched items, so hand out the stored
+        # dicts; only the list itself is fresh (pull may delete while iterating).
+        return list(self.tasks.values())
 
     def upsert_task(self, tasklist_id, local_task):
-        self.inserted.append((tasklist_id, dict(local_task)))
+        self.inserted.append((tasklist_id, local_task))
         gtask_id = local_task.get("gtask_id")
         if not gtask_id:
             # Mirror the real bridge: dedupe by uid found in planner metadata.
@@ -185,6 +187,14 @@ def _create_task(session_factory, title="Test", **kwargs):
         return task.id, task.uid
 
 
+def _create_tasks(session_factory, count, title="Test"):
+    with session_factory() as session:
+        tasks = [Task(title=f"{title} {i}", start=None) for i in range(count)]
+        session.add_all(tasks)
+        session.commit()
+        return [(task.id, task.uid) for task in tasks]
+
+
 def test_push_dirty_creates_mapping_and_updates_index(session_factory):
     task_id, task_uid = _create_task(session_factory)
 
@@ -210,6 +220,27 @@ def test_push_dirty_creates_mapping_and_updates_index(session_factory):
     assert appdata.config["tasklist_id"] == "list-1"
 
 
+def test_push_dirty_maps_many_tasks_in_one_pass(session_factory):
+    created = _create_tasks(session_factory, 5)
+
+    bridge = FakeBridge()
+    appdata = FakeAppData()
+    sync = _make_sync(session_factory, bridge, appdata)
+
+    assert sync.push_dirty() is True
+    assert len(bridge.inserted) == len(created)
+
+    with session_factory() as session:
+        mappings = [session.get(SyncMapUndated, str(task_id)) for task_id, _ in created]
+    assert all(m is not None and m.dirty_flag == 0 for m in mappings)
+    assert len({m.gtask_id for m in mappings}) == len(created)
+    assert {m.task_uid for m in mappings} == {uid for _, uid in created}
+
+    # Everything is clean now: a second pass must not touch the bridge.
+    assert sync.push_dirty() is False
+    assert len(bridge.inserted) == len(created)
+
+
 def test_split_notes_extracts_metadata_and_body():
     meta = {"task_id": "42", "status": "todo"}
     body = "Hello\nWorld"
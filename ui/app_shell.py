@@ -2,7 +2,14 @@
 from __future__ import annotations
 
 import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import flet as ft
+from google.auth.exceptions import TransportError
+from googleapiclient.errors import HttpError
+from httplib2 import HttpLib2Error
 
 from core.settings import UI, GOOGLE_SYNC, UNDATED_ENGINE_UNDATED
 
@@ -11,6 +18,7 @@ from .pages.today import TodayPage
 from .pages.calendar import CalendarPage
 from .pages.settings import SettingsPage
 from .pages.history import HistoryPage
+from .dialogs import close_alert_dialog, show_alert_dialog
 
 # Google
 from services.appdata import AppDataClient
@@ -26,7 +34,26 @@ from services.daily_tasks_sync import DailyTasksSync
 from services.undated_tasks_sync import UndatedTasksSync
 
 
+# сетевые сбои, при которых Google считаем временно недоступным
+_NETWORK_ERRORS = (OSError, TransportError, HttpLib2Error)
+_TRANSIENT_HTTP_STATUS = {429, 500, 502, 503, 504}
+# потолок паузы автообновления при серии сетевых сбоев
+_PULL_BACKOFF_CAP_SEC = 900.0
+# сколько фоновый push ждёт, собирая серию правок в один прогон очереди
+_PUSH_DEBOUNCE_SEC = 0.25
+
+
+def _is_transient_google_error(exc: Exception) -> bool:
+    if isinstance(exc, HttpError):
+        status = getattr(getattr(exc, "resp", None), "status", None)
+        return status in _TRANSIENT_HTTP_STATUS
+    return isinstance(exc, _NETWORK_ERRORS)
+
+
 class AppShell:
+    # метки слоёв, которые cleanup_overlays может снимать из page.overlay
+    _REMOVABLE_OVERLAY_TAGS = frozenset({"planner_layer", "planner_backdrop"})
+
     def __init__(self, page: ft.Page):
         self.page = page
 
@@ -35,6 +62,10 @@ class AppShell:
 
         # обработка Esc для закрытия модалок/оверлеев
         self.page.on_keyboard_event = self._on_key
+        # после сна/сворачивания сразу сверяем дату ежедневных задач
+        self.page.on_app_lifecycle_state_change = self._on_lifecycle
+        # закрытие сессии — гасим фоновые циклы, чтобы не висели в памяти
+        self.page.on_disconnect = self._on_disconnect
 
         # базовые настройки окна
         self.page.title = UI.app_title
@@ -77,10 +108,15 @@ class AppShell:
         DailyTaskService.subscribe("after_delete", self.daily_tasks_sync.on_task_deleted)
 
         # --- страницы ---
+        # «Сегодня» открывается при старте — строим сразу; остальные вкладки
+        # создаются при первом переходе (см. _page)
         self._today = TodayPage(self)
-        self._calendar = CalendarPage(self)
-        self._history = HistoryPage(self)
-        self._settings = SettingsPage(self)  # использует self.gcal
+        self._page_factories = {
+            "calendar": CalendarPage,
+            "history": HistoryPage,
+            "settings": SettingsPage,  # использует self.gcal
+        }
+        self._page_cache: dict[str, object] = {}
 
         # контейнер контента
         self.content = ft.Container(expand=True)
@@ -136,7 +172,31 @@ class AppShell:
 
         # автообновление активной страницы
         self._auto_task: asyncio.Task | None = None
+        # сама asyncio-задача цикла (run_task отдаёт лишь concurrent Future,
+        # который после cancel() сразу done() — дождаться по нему нельзя)
+        self._auto_loop_task: asyncio.Task | None = None
         self._active_view: str | None = None  # "today" | "calendar" | "history" | "settings"
+        # стоп-сигнал цикла автообновления для каждого view; цикл ждёт его
+        # вместо сна + сравнения строк, поэтому уход со страницы будит его сразу
+        self._view_events: dict[str, asyncio.Event] = {}
+        self._auto_loop: asyncio.AbstractEventLoop | None = None
+        # pull идёт в рабочих потоках (цикл, смена вкладок, ручной синк) —
+        # не даём двум прогонам бить в Google одновременно; push из пула
+        # берёт тот же замок
+        self._pull_lock = threading.Lock()
+        # push в Google — в одном фоновом потоке: обработчики UI не ждут сеть,
+        # а прогоны очереди идут строго по одному
+        self._gcal_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="google-push")
+        self._push_lock = threading.Lock()
+        self._push_pending = False
+        # сетевые сбои pull подряд — для экспоненциальной паузы автообновления
+        self._pull_fail_count = 0
+        self._last_pull_failed = False
+        # поколение запросов pull от навигации: выполняется только последний
+        self._nav_pull_generation = 0
+        # диалоги, открытые через show_dialog(): проверка «что-то открыто»
+        # в цикле автообновления не перебирает их в page.overlay
+        self._open_dialogs: set[int] = set()
 
     def cleanup_overlays(self):
         """Remove closed app overlays marked with planner-specific data tags."""
@@ -144,34 +204,68 @@ class AppShell:
         if overlays is None:
             return
 
-        allowed_tags = {"planner_layer", "planner_backdrop"}
-        changed = False
+        allowed_tags = self._REMOVABLE_OVERLAY_TAGS
+        # один проход без list.remove (каждый remove — O(N))
+        keep = [
+            ctrl
+            for ctrl in overlays
+            if getattr(ctrl, "data", None) not in allowed_tags or getattr(ctrl, "open", False)
+        ]
 
-        for ctrl in list(overlays):
-            if getattr(ctrl, "data", None) not in allowed_tags:
-                continue
-            if hasattr(ctrl, "open") and getattr(ctrl, "open", False):
-                continue
-            try:
-                overlays.remove(ctrl)
-                changed = True
-            except ValueError:
-                pass
-
-        if changed:
+        if len(keep) != len(overlays):
+            overlays[:] = keep
             self.page.update()
 
-    def toast(self, text: str, *, ok: bool = True):
+    def toast(self, text: str, *, ok: bool = True, update_page: bool = True):
+        """Показать snackbar; update_page=False — отправить только его, без диффа страницы."""
         sb = self.page.snack_bar
         sb.bgcolor = ft.Colors.GREEN_600 if ok else ft.Colors.RED_600
-        sb.content = ft.Text(text)
+        if isinstance(sb.content, ft.Text):
+            sb.content.value = text
+        else:
+            sb.content = ft.Text(text)
         sb.open = True
-        self.page.update()
+        if update_page:
+            self.page.update()
+            return
+        try:
+            sb.update()
+        except Exception:
+            # snackbar ещё ни разу не отрисован — тогда через страницу
+            self.page.update()
+
+    def show_dialog(self, dlg: ft.AlertDialog, on_close=None) -> ft.AlertDialog:
+        """Показать диалог с учётом в наборе открытых окон."""
+        self._open_dialogs.add(id(dlg))
+
+        def _on_dismiss(e, _dlg=dlg):
+            self._open_dialogs.discard(id(_dlg))
+            if on_close:
+                on_close()
+
+        dlg.on_dismiss = _on_dismiss
+        return show_alert_dialog(self.page, dlg)
+
+    def close_dialog(self) -> None:
+        dlg = getattr(self.page, "_planner_active_dialog", None) or getattr(self.page, "dialog", None)
+        if dlg is not None:
+            self._open_dialogs.discard(id(dlg))
+        close_alert_dialog(self.page)
+
+    def _on_lifecycle(self, e) -> None:
+        if getattr(e, "state", None) in (ft.AppLifecycleState.RESUME, ft.AppLifecycleState.SHOW):
+            self._today.daily_tasks_panel.wake_rollover()
+
+    def _on_disconnect(self, e) -> None:
+        self._stop_auto_refresh()
+        self._today.daily_tasks_panel.dispose()
+        self._gcal_pool.shutdown(wait=False)
 
     def _on_key(self, e: ft.KeyboardEvent):
         if e.key != "Escape":
             return
         if self.page.dialog and getattr(self.page.dialog, "open", False):
+            self._open_dialogs.discard(id(self.page.dialog))
             self.page.dialog.open = False
             self.page.update()
             return
@@ -186,30 +280,49 @@ class AppShell:
     # ---------- утилиты ----------
     def _has_open_overlay(self) -> bool:
         """Если открыт любой диалог/оверлей — пропускаем автообновление."""
+        if self._open_dialogs:
+            return True
         try:
             if getattr(self.page, "dialog", None) and getattr(self.page.dialog, "open", False):
                 return True
         except Exception:
             pass
+        # пикеры дат страницы открывают сами через page.open — их видно только в overlay
         try:
             return any(getattr(c, "open", False) for c in (self.page.overlay or []))
         except Exception:
             return False
 
-    def _pull_from_google(self) -> bool:
+    def _pull_from_google_sync(self) -> bool | None:
         """
-        Подтягиваем изменения из Google -> локально.
+        Подтягиваем изменения из Google -> локально (блокирующие HTTPS-вызовы).
         Возвращает True, если локальная база изменилась (для логов/отладки).
+        Если замок занят (идёт другой pull или push), прогон пропускается — None.
         """
+        if not self._pull_lock.acquire(blocking=False):
+            return None
+        try:
+            changed = self._pull_from_google_locked()
+        finally:
+            self._pull_lock.release()
+        if changed:
+            # синки пишут и мимо TaskService — помечаем данные как изменённые
+            TaskService.touch()
+        return changed
+
+    def _pull_from_google_locked(self) -> bool:
         changed = False
+        failed = False
         try:
             changed |= self.sync_service.pull_all()
         except Exception as e:
+            failed |= _is_transient_google_error(e)
             print("Google sync error:", e)
         try:
             if self.undated_tasks_sync is not None and self.undated_tasks_sync.sync():
                 changed = True
         except Exception as e:
+            failed |= _is_transient_google_error(e)
             print("Undated tasks sync error:", e)
         try:
             if self.daily_tasks_sync.pull():
@@ -217,9 +330,75 @@ class AppShell:
                 if self._today:
                     self._today.refresh_daily_tasks()
         except Exception as e:
+            failed |= _is_transient_google_error(e)
             print("Daily tasks sync error:", e)
+        self._last_pull_failed = failed
         return changed
 
+    def _next_refresh_delay(self, period: float, elapsed: float, pulled: bool = True) -> float:
+        """Пауза до следующего тика: обычная или экспоненциальная при сбоях сети.
+
+        pulled=False — pull этого тика пропущен (замок был занят): счётчик
+        сбоев не трогаем, флаг последнего прогона к этому тику не относится.
+        """
+        if pulled:
+            if self._last_pull_failed:
+                self._pull_fail_count += 1
+            else:
+                self._pull_fail_count = 0
+        if not self._pull_fail_count:
+            return max(1.0, period - elapsed)
+        backoff = min(_PULL_BACKOFF_CAP_SEC, period * 2 ** self._pull_fail_count)
+        # джиттер, чтобы несколько клиентов не стучались синхронно
+        return backoff + random.uniform(0, backoff * 0.1)
+
+    async def _pull_from_google_async(self) -> bool | None:
+        """Тот же pull, но в рабочем потоке — цикл событий UI не блокируется."""
+        return await asyncio.to_thread(self._pull_from_google_sync)
+
+    async def _pull_then_refresh(self, refresh_fn) -> None:
+        """Фоновый pull; перерисовка — уже в потоке цикла и только если что-то изменилось."""
+        try:
+            if await self._pull_from_google_async():
+                refresh_fn()
+        except Exception as e:
+            print("background pull:", e)
+
+    def _schedule_debounced_pull(self, refresh_fn, delay: float = 0.4) -> None:
+        """Pull после паузы; быстрые переключения вкладок сливаются в один запрос."""
+        self._nav_pull_generation += 1
+        self.page.run_task(self._debounced_pull, self._nav_pull_generation, refresh_fn, delay)
+
+    async def _debounced_pull(self, generation: int, refresh_fn, delay: float) -> None:
+        await asyncio.sleep(delay)
+        if generation != self._nav_pull_generation:
+            return  # за время паузы пользователь ушёл на другую вкладку
+        await self._pull_then_refresh(refresh_fn)
+
+    def _schedule_push(self) -> None:
+        """Поставить push в фоновый поток; ещё не начатый прогон покрывает и этот вызов."""
+        if not GOOGLE_SYNC.enabled:
+            return
+        with self._push_lock:
+            if self._push_pending:
+                return
+            self._push_pending = True
+        try:
+            self._gcal_pool.submit(self._push_job)
+        except RuntimeError:
+            # пул уже остановлен (сессия закрыта)
+            self._push_pending = False
+
+    def _push_job(self) -> None:
+        # короткое окно: серия перетаскиваний уходит одним прогоном очереди
+        time.sleep(_PUSH_DEBOUNCE_SEC)
+        with self._push_lock:
+            self._push_pending = False
+        # тот же замок, что и у pull: undated_tasks_sync держит общее состояние
+        # для sync() и push_dirty(), прогоны не должны пересекаться
+        with self._pull_lock:
+            self._push_to_google()
+
     def _push_to_google(self):
         if not GOOGLE_SYNC.enabled:
             return
@@ -241,44 +420,99 @@ class AppShell:
             if run_immediately:
                 refresh_fn()
             return
-        self._stop_auto_refresh()
+        previous = self._stop_auto_refresh()
         self._active_view = view_name
+        stop_event = asyncio.Event()
+        self._view_events[view_name] = stop_event
 
         interval = period_sec or GOOGLE_SYNC.auto_pull_interval_sec or UI.auto_refresh.interval_sec
 
         async def _loop():
+            # методы и настройки не меняются, пока жив цикл — берём их в локальные
+            pull = self._pull_from_google_async
+            push = self._schedule_push
+            has_overlay = self._has_open_overlay
+            wait_for = asyncio.wait_for
+            wait_stop = stop_event.wait
+            period = float(interval)
+            self._auto_loop = asyncio.get_running_loop()
+            self._auto_loop_task = asyncio.current_task()
+
+            # прежний цикл отменён, но мог ещё не дойти до точки отмены —
+            # дожидаемся его, чтобы два цикла никогда не работали вместе;
+            # отмена самого этого цикла при ожидании пробрасывается наружу
+            if previous is not None and not previous.done():
+                await asyncio.wait({previous})
+
             # первый прогон — сразу: подтянуть изменения и перерисовать
-            if run_immediately:
+            if run_immediately and not stop_event.is_set():
                 try:
-                    self._pull_from_google()
+                    await pull()
+                    if stop_event.is_set():
+                        return
                     refresh_fn()
-                    self._push_to_google()
+                    push()
                 except Exception as e:
                     print("auto refresh (initial):", e)
 
-            while self._active_view == view_name:
-                await asyncio.sleep(interval)
-                if self._active_view != view_name:
-                    break
-                if self._has_open_overlay():
+            clock = self._auto_loop.time
+            delay = period
+            while not stop_event.is_set():
+                try:
+                    await wait_for(wait_stop(), timeout=delay)
+                    break  # view сменился — выходим без лишнего тика
+                except asyncio.TimeoutError:
+                    pass
+                delay = period
+                if has_overlay():
                     continue
+                started = clock()
+                pulled = False
                 try:
-                    self._pull_from_google()
+                    pulled = await pull() is not None
+                    if stop_event.is_set():
+                        break  # пока шёл pull, ушли на другую вкладку
                     refresh_fn()
-                    self._push_to_google()
+                    push()
                 except Exception as e:
                     print("auto refresh:", e)
+                # следующий тик планируем от завершения этого: медленная сеть
+                # не даёт пачек запросов подряд, а лежащий Google — ровного потока
+                delay = self._next_refresh_delay(period, clock() - started, pulled)
 
         self._auto_task = self.page.run_task(_loop)
 
     def _stop_auto_refresh(self):
+        """Остановить цикл автообновления; возвращает asyncio-задачу отменённого цикла (или None)."""
+        if self._active_view is not None:
+            self._signal_stop(self._view_events.pop(self._active_view, None))
+        task = self._auto_task
         try:
-            if self._auto_task:
-                self._auto_task.cancel()
+            if task:
+                task.cancel()
         except Exception:
             pass
+        previous = self._auto_loop_task
         self._auto_task = None
+        self._auto_loop_task = None
         self._active_view = None
+        return previous
+
+    def _signal_stop(self, event: asyncio.Event | None) -> None:
+        """Выставить стоп-событие; обработчики flet зовут нас не из потока цикла."""
+        if event is None:
+            return
+        loop = self._auto_loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(event.set)
+        else:
+            event.set()
+
+    def _page(self, name: str):
+        page = self._page_cache.get(name)
+        if page is None:
+            page = self._page_cache[name] = self._page_factories[name](self)
+        return page
 
     # ---------- монтаж ----------
     def mount(self):
@@ -293,39 +527,44 @@ class AppShell:
         self.content.content = self._today.view
         self.page.update()
 
+        # сначала рисуем локальные данные, изменения из Google догоняют в фоне
         self._today.mount()
-
-        self._pull_from_google()
-        self._today.activate_from_menu()
+        self._schedule_debounced_pull(self._today.activate_from_menu)
         self._start_auto_refresh("today", self._today.load, run_immediately=False)
 
     def show_calendar(self):
+        calendar = self._page("calendar")
         self.cleanup_overlays()
         self.nav.selected_index = 1
-        self.content.content = self._calendar.view
+        self.content.content = calendar.view
         self.page.update()
 
-        self._pull_from_google()
-        self._calendar.activate_from_menu()
+        calendar.activate_from_menu()
         try:
-            self._calendar.scroll_to_now()  # к текущему часу
+            calendar.scroll_to_now()  # к текущему часу
         except Exception:
             pass
-        self._start_auto_refresh("calendar", self._calendar.load, run_immediately=False)
+        # свежие данные из Google при переходе; сливается с pull из calendar.load()
+        self._schedule_debounced_pull(calendar.reload_local)
+        self._start_auto_refresh("calendar", calendar.reload_local, run_immediately=False)
 
     def show_history(self):
+        history = self._page("history")
         self.cleanup_overlays()
         self.nav.selected_index = 2
-        self.content.content = self._history.view
+        self.content.content = history.view
         self._stop_auto_refresh()
+        self._nav_pull_generation += 1  # отложенный pull прошлой вкладки больше не нужен
         self.page.update()
-        self._history.activate_from_menu()
+        history.activate_from_menu()
 
     def show_settings(self):
+        settings = self._page("settings")
         self.cleanup_overlays()
         self.nav.selected_index = 3
-        self.content.content = self._settings.view
+        self.content.content = settings.view
         self._stop_auto_refresh()
+        self._nav_pull_generation += 1  # отложенный pull прошлой вкладки больше не нужен
         self.page.update()
 
     # ---------- переключение вкладок ----------
@@ -349,17 +588,21 @@ class AppShell:
     def current_page_auto_sync(self):
         if self._has_open_overlay():
             return
-        self._pull_from_google()
-        self._push_to_google()
+        self._pull_from_google_sync()
+        self._schedule_push()  # через тот же поток, что и остальные push
         if self._active_view == "calendar":
-            self._calendar.load()
+            self._page("calendar").reload_local()
         elif self._active_view == "today":
             self._today.load()
 
     # ---------- публичные утилиты для страниц ----------
     def push_tasks_to_google(self) -> None:
-        """Expose push-to-Google routine for UI pages."""
-        self._push_to_google()
+        """Expose push-to-Google routine for UI pages (runs in the background)."""
+        self._schedule_push()
+
+    def pull_in_background(self, refresh_fn) -> None:
+        """Pull из Google в фоне; refresh_fn — только если локальные данные изменились."""
+        self._schedule_debounced_pull(refresh_fn)
 
     def connect_google_services(self) -> bool:
         try:
@@ -4,20 +4,30 @@ HAS_WRAP = hasattr(ft, "Wrap")
 TEXT_ACCEPTS_DECORATION = "decoration" in ft.Text.__init__.__code__.co_varnames
 
 
-def wrap_row(controls, spacing=12, run_spacing=8):
-    if HAS_WRAP:
-        return ft.Wrap(controls=controls, spacing=spacing, run_spacing=run_spacing)
+# Версия flet не меняется во время работы, поэтому ветку выбираем один раз
+# при импорте, а не при каждом вызове.
+def _wrap_row_native(controls, spacing=12, run_spacing=8):
+    return ft.Wrap(controls=controls, spacing=spacing, run_spacing=run_spacing)
+
+
+def _wrap_row_legacy(controls, spacing=12, run_spacing=8):
     return ft.Row(controls=controls, wrap=True, spacing=spacing, run_spacing=run_spacing)
 
 
-def strike_text(text: str, *, tooltip: str | None = None, strike: bool = False):
-    if TEXT_ACCEPTS_DECORATION:
-        t = ft.Text(text, tooltip=tooltip)
-        if strike:
-            t.decoration = ft.TextDecoration.LINE_THROUGH
-        return t
+def _strike_text_decoration(text: str, *, tooltip: str | None = None, strike: bool = False):
+    t = ft.Text(text, tooltip=tooltip)
+    if strike:
+        t.decoration = ft.TextDecoration.LINE_THROUGH
+    return t
+
+
+def _strike_text_style(text: str, *, tooltip: str | None = None, strike: bool = False):
     return ft.Text(
         text,
         tooltip=tooltip,
         style=ft.TextStyle(decoration=ft.TextDecoration.LINE_THROUGH if strike else None),
     )
+
+
+wrap_row = _wrap_row_native if HAS_WRAP else _wrap_row_legacy
+strike_text = _strike_text_decoration if TEXT_ACCEPTS_DECORATION else _strike_text_style
@@ -2,26 +2,91 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache, partial
 import locale
-from typing import List
+from operator import itemgetter
+from typing import Callable, List
 
 import flet as ft
 
 from core.settings import UI
 from ui import compat
-from ui.dialogs import close_alert_dialog, open_alert_dialog
 from services.daily_tasks import DailyTaskService
 from models.daily_task import DailyTask
 
 
 WEEKDAY_LABELS = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"]
-
-try:
-    locale.setlocale(locale.LC_COLLATE, "ru_RU.UTF-8")
-except locale.Error:
-    # если локаль недоступна в окружении — используем системную по умолчанию
-    pass
+# порядок групп в списке: активные, выполненные сегодня, неактивные
+_GROUP_ORDER = {"active": 0, "done_today": 1, "inactive": 2}
+# asyncio.sleep идёт по монотонным часам, которые стоят во время сна ОС;
+# спим кусками не длиннее этого и сверяемся с настенными часами
+_ROLLOVER_MAX_NAP_SEC = 15 * 60
+_ONE_DAY = timedelta(days=1)
+_MIDNIGHT = datetime.min.time()
+# пока открыт диалог панели, rollover откладывается на столько секунд
+_ROLLOVER_DIALOG_RETRY_SEC = 2
+WEEKDAY_BITS = tuple(1 << i for i in range(len(WEEKDAY_LABELS)))
+# подписи дней для всех 128 значений 7-битной маски — строятся один раз
+_WEEKDAY_FLAGS = tuple(
+    ", ".join(label for bit, label in zip(WEEKDAY_BITS, WEEKDAY_LABELS) if mask & bit)
+    for mask in range(1 << len(WEEKDAY_LABELS))
+)
+# цвета, одинаковые для всех строк: считаем один раз, а не на каждую карточку
+_BORDER_COLOR = ft.Colors.with_opacity(0.05, ft.Colors.ON_SURFACE)
+_TITLE_ACTIVE = ft.Colors.with_opacity(1.0, ft.Colors.ON_SURFACE)
+_TITLE_DONE = ft.Colors.with_opacity(0.7, UI.theme.text_subtle)
+# ширина карточки в ResponsiveRow: на широких экранах — две колонки
+_COL_HALF = {"xs": 12, "md": 12, "lg": 6, "xl": 6}
+# отступы/рамки/стили — неизменяемые значения, общие для всех карточек
+_ITEM_PADDING = ft.padding.symmetric(horizontal=12, vertical=10)
+_ITEM_BORDER = ft.border.all(1, _BORDER_COLOR)
+_EMPTY_PADDING = ft.padding.symmetric(vertical=8, horizontal=12)
+_ADD_BUTTON_STYLE = ft.ButtonStyle(
+    bgcolor=ft.Colors.with_opacity(0.06, ft.Colors.ON_SURFACE),
+    color=ft.Colors.BLUE_GREY_600,
+    padding=ft.padding.symmetric(vertical=12, horizontal=16),
+    shape=ft.RoundedRectangleBorder(radius=10),
+)
+
+# перечисления flet, нужные в каждой строке, — разрешаем один раз
+_SUBTITLE_COLOR = ft.Colors.BLUE_GREY_400
+_SURFACE = ft.Colors.SURFACE
+_ICON_EDIT = ft.Icons.EDIT_OUTLINED
+_ICON_DELETE = ft.Icons.DELETE_OUTLINE
+_W_600 = ft.FontWeight.W_600
+_ELLIPSIS = ft.TextOverflow.ELLIPSIS
+_ALIGN_END = ft.MainAxisAlignment.END
+_ALIGN_SPACE_BETWEEN = ft.MainAxisAlignment.SPACE_BETWEEN
+_CROSS_CENTER = ft.CrossAxisAlignment.CENTER
+_CHECKBOX_ALIGN = ft.alignment.center
+
+# setlocale меняет состояние всего процесса — делаем это не при импорте,
+# а при первой сортировке, и только один раз
+_locale_ready = False
+# ключ сравнения выбирается один раз: strxfrm, если русская локаль встала,
+# иначе сам casefold-заголовок (strxfrm в C-локали ничего не даёт)
+_title_collate: Callable[[str], str] = str
+
+
+def _ensure_ru_collate() -> None:
+    global _locale_ready, _title_collate
+    if _locale_ready:
+        return
+    _locale_ready = True
+    try:
+        locale.setlocale(locale.LC_COLLATE, "ru_RU.UTF-8")
+        _title_collate = locale.strxfrm
+    except locale.Error:
+        # если локаль недоступна в окружении — сортируем по casefold()
+        pass
+
+
+@lru_cache(maxsize=512)
+def _title_sort_key(title: str) -> str:
+    # заголовки между перерисовками почти не меняются; локаль выбирается
+    # один раз в _ensure_ru_collate, поэтому кэш не устаревает
+    return _title_collate(title.casefold())
 
 
 class DailyTasksPanel:
@@ -29,8 +94,45 @@ class DailyTasksPanel:
         self.app = app_shell
         self.svc = DailyTaskService()
         self._tasks: list[DailyTask] = []
-        self._dialog: ft.AlertDialog | None = None
+        self._tasks_by_id: dict[str, DailyTask] = {}
         self._rollover_task: asyncio.Task | None = None
+        self._last_rollover_date: date | None = None
+        # будильник цикла rollover: wake_rollover() прерывает сон досрочно
+        self._rollover_wake: asyncio.Event | None = None
+        self._rollover_event_loop: asyncio.AbstractEventLoop | None = None
+        # обёртки строк по id задачи вместе с данными, по которым они собраны,
+        # и порядок последней отрисовки: неизменённые строки не пересобираются
+        self._item_cache: dict[str, tuple[tuple, ft.Container]] = {}
+        self._rendered_order: list[str] = []
+        # снимок того, что сейчас нарисовано: одинаковые данные не перерисовываем
+        self._last_fingerprint: tuple | None = None
+
+        # диалог удаления одинаков для всех задач: собираем один раз,
+        # при открытии меняется только id удаляемой задачи
+        self._pending_delete_id: str | None = None
+        self._confirm_dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Удалить задачу?"),
+            content=ft.Text("Действие нельзя отменить"),
+            actions=[
+                ft.TextButton("Отмена", on_click=lambda e: self.app.close_dialog()),
+                ft.FilledButton(
+                    "Удалить",
+                    icon=ft.Icons.DELETE_OUTLINE,
+                    on_click=lambda e: self._run(self._on_confirm_delete, e),
+                ),
+            ],
+            actions_alignment=ft.MainAxisAlignment.END,
+        )
+
+        # диалог создания/редактирования тоже один: при открытии меняются
+        # только значения полей и id редактируемой задачи (None — новая)
+        self._editing_task_id: str | None = None
+        self._edit_dlg = self._build_edit_dialog()
+
+        # кнопка «Добавить» и пустое состояние не зависят от данных
+        self._add_row = ft.Container(self._add_button(), col=_COL_HALF)
+        self._empty_row = ft.Container(self._empty_state(), col=_COL_HALF)
 
         self._list_holder = ft.ResponsiveRow(run_spacing=10, spacing=14)
 
@@ -49,47 +151,100 @@ class DailyTasksPanel:
 
     # ---------- Data ----------
     def refresh(self):
-        self.svc.rollover_if_needed()
-        self._tasks = self.svc.list_all()
-        self._render_list()
+        # сервис ходит в SQLite — читаем в фоновом потоке, рисуем по готовности
+        self._run(self._refresh_async)
         self._ensure_rollover_timer()
 
-    # ---------- Rendering ----------
-    def _render_list(self):
-        controls = [self._build_item(task) for task in self._sorted_tasks()]
-        add_button = self._add_button()
+    async def _refresh_async(self):
+        self._set_tasks(await asyncio.to_thread(self._do_rollover))
+        # _render_list сам отправит список, если в нём что-то поменялось
+        self._render_list()
 
-        if not controls:
-            controls = [add_button, self._empty_state()]
-        else:
-            controls.append(add_button)
+    def _do_rollover(self) -> list[DailyTask]:
+        # rollover и перечитывание списка — за один переход в поток
+        self.svc.rollover_if_needed()
+        self._last_rollover_date = date.today()
+        return self.svc.list_all()
 
-        self._list_holder.controls = [
-            ft.Container(ctrl, col={"xs": 12, "md": 12, "lg": 6, "xl": 6})
-            for ctrl in controls
-        ]
-        self.app.page.update()
+    def _set_tasks(self, tasks: list[DailyTask]) -> None:
+        self._tasks = tasks
+        self._tasks_by_id = {t.id: t for t in tasks}
 
-    def _sorted_tasks(self) -> List[DailyTask]:
-        def group_key(task: DailyTask) -> int:
-            return {"active": 0, "done_today": 1, "inactive": 2}.get(task.status_today, 3)
+    def _run(self, handler, *args):
+        self.app.page.run_task(handler, *args)
+
+    def _update_list(self):
+        try:
+            # меняется только список — отправляем только его поддерево
+            self._list_holder.update()
+        except Exception:
+            # ещё не смонтирован на странице
+            self.app.page.update()
 
-        def title_key(task: DailyTask) -> str:
-            return locale.strxfrm(task.title.casefold())
+    # ---------- Rendering ----------
+    @staticmethod
+    def _item_signature(task: DailyTask) -> tuple:
+        return (task.title, task.weekdays, task.status_today)
+
+    @classmethod
+    def _fingerprint(cls, tasks: List[DailyTask]) -> tuple:
+        return tuple((t.id, cls._item_signature(t)) for t in tasks)
+
+    def _cached_row(self, task: DailyTask, cache: dict[str, tuple[tuple, ft.Container]]) -> ft.Container:
+        signature = self._item_signature(task)
+        cached = self._item_cache.get(task.id)
+        if cached is None:
+            row = ft.Container(self._build_item(task), col=_COL_HALF)
+        else:
+            row = cached[1]
+            if cached[0] != signature:
+                row.content = self._build_item(task)
+        cache[task.id] = (signature, row)
+        return row
 
-        return sorted(self._tasks, key=lambda t: (group_key(t), title_key(t)))
+    def _render_list(self):
+        # снимок берём с несортированного списка: при тех же данных
+        # не тратим время даже на сортировку
+        fingerprint = self._fingerprint(self._tasks)
+        if fingerprint == self._last_fingerprint:
+            return
+        self._last_fingerprint = fingerprint
+        ordered = self._sorted_tasks()
+        cache: dict[str, tuple[tuple, ft.Container]] = {}
+        rows = [self._cached_row(task, cache) for task in ordered]
+        # удалённые задачи выпадают из кэша вместе со старым словарём
+        self._item_cache = cache
+        self._rendered_order = [task.id for task in ordered]
+
+        if not rows:
+            self._list_holder.controls = [self._add_row, self._empty_row]
+        else:
+            rows.append(self._add_row)
+            self._list_holder.controls = rows
+        self._update_list()
+
+    def _sorted_tasks(self) -> List[DailyTask]:
+        _ensure_ru_collate()
+        # decorate-sort-undecorate: strxfrm считается один раз на задачу,
+        # а не при каждом сравнении
+        decorated = [
+            ((_GROUP_ORDER.get(t.status_today, 3), _title_sort_key(t.title)), t)
+            for t in self._tasks
+        ]
+        decorated.sort(key=itemgetter(0))
+        return [t for _, t in decorated]
 
     def _weekday_flags(self, task: DailyTask) -> str:
-        parts = []
-        for i, label in enumerate(WEEKDAY_LABELS):
-            if task.weekdays & (1 << i):
-                parts.append(label)
-        return ", ".join(parts)
+        return _WEEKDAY_FLAGS[task.weekdays & 0x7F]
+
     def _on_edit_click(self, e: ft.ControlEvent):
         self._open_dialog(task_id=str(e.control.data))
 
     def _on_delete_click(self, e: ft.ControlEvent):
         self._confirm_delete(str(e.control.data))
+
+    def _handle_toggle(self, task_id: str, e: ft.ControlEvent):
+        self._run(self._on_toggle, task_id, e.control.value)
         
     def _build_item(self, task: DailyTask) -> ft.Control:
         checked = task.status_today == "done_today"
@@ -97,30 +252,27 @@ class DailyTasksPanel:
 
         checkbox = ft.Checkbox(
             value=checked,
-            on_change=lambda e, tid=task.id: self._on_toggle(tid, e.control.value),
+            on_change=partial(self._handle_toggle, task.id),
             tooltip="Отметить как выполнено",
             disabled=is_inactive,
             semantics_label=f"Отметить ежедневную задачу {task.title}",
         )
 
-        title_color = UI.theme.text_subtle if checked else None
-        title_opacity = 0.7 if checked else 1.0
-
         title = compat.strike_text(task.title, tooltip=task.title, strike=getattr(task, "done", False))
         title.max_lines = 1
-        title.overflow = ft.TextOverflow.ELLIPSIS
+        title.overflow = _ELLIPSIS
         title.size = 14
-        title.weight = ft.FontWeight.W_600
-        title.color = ft.Colors.with_opacity(title_opacity, title_color or ft.Colors.ON_SURFACE)
+        title.weight = _W_600
+        title.color = _TITLE_DONE if checked else _TITLE_ACTIVE
 
         subtitle = ft.Text(
             self._weekday_flags(task),
             size=12,
-            color=ft.Colors.BLUE_GREY_400,
+            color=_SUBTITLE_COLOR,
         )
 
         edit_btn = ft.IconButton(
-            icon=ft.Icons.EDIT_OUTLINED,
+            icon=_ICON_EDIT,
             tooltip="Редактировать",
             data=task.id,
             on_click=self._on_edit_click,
@@ -129,7 +281,7 @@ class DailyTasksPanel:
             height=34,
         )
         delete_btn = ft.IconButton(
-            icon=ft.Icons.DELETE_OUTLINE,
+            icon=_ICON_DELETE,
             tooltip="Удалить",
             data=task.id,
             on_click=self._on_delete_click,
@@ -138,22 +290,22 @@ class DailyTasksPanel:
             height=34,
         )
 
-        actions = ft.Row([edit_btn, delete_btn], spacing=4, alignment=ft.MainAxisAlignment.END)
+        actions = ft.Row([edit_btn, delete_btn], spacing=4, alignment=_ALIGN_END)
 
         item = ft.Container(
             content=ft.Row(
                 [
-                    ft.Container(width=42, alignment=ft.alignment.center, content=checkbox),
+                    ft.Container(width=42, alignment=_CHECKBOX_ALIGN, content=checkbox),
                     ft.Column([title, subtitle], spacing=4, expand=True),
                     actions,
                 ],
-                vertical_alignment=ft.CrossAxisAlignment.CENTER,
-                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                vertical_alignment=_CROSS_CENTER,
+                alignment=_ALIGN_SPACE_BETWEEN,
             ),
-            padding=ft.padding.symmetric(horizontal=12, vertical=10),
-            bgcolor=ft.Colors.SURFACE,
+            padding=_ITEM_PADDING,
+            bgcolor=_SURFACE,
             border_radius=10,
-            border=ft.border.all(1, ft.Colors.with_opacity(0.05, ft.Colors.ON_SURFACE)),
+            border=_ITEM_BORDER,
             animate_opacity=150,
         )
 
@@ -161,30 +313,46 @@ class DailyTasksPanel:
             item.opacity = 0.7
         return item
 
-    def _on_toggle(self, task_id: str, checked: bool):
+    async def _on_toggle(self, task_id: str, checked: bool):
         try:
-            self.svc.toggle(task_id, done=checked)
+            updated = await asyncio.to_thread(self.svc.toggle, task_id, done=checked)
         except ValueError as e:
             self._toast(str(e))
-        self.refresh()
+            # данные не изменились, а чекбокс уже переключён на экране —
+            # сбрасываем снимок и строку, чтобы перерисовка вернула его назад
+            self._item_cache.pop(task_id, None)
+            self._last_fingerprint = None
+            await self._refresh_async()
+            return
+        previous = self._tasks_by_id.get(task_id)
+        if updated is None or previous is None:
+            await self._refresh_async()
+            return
+
+        # без повторного list_all(): подменяем одну задачу в локальном списке
+        self._tasks[self._tasks.index(previous)] = updated
+        self._tasks_by_id[task_id] = updated
+        ordered = self._sorted_tasks()
+        if task_id not in self._item_cache or [t.id for t in ordered] != self._rendered_order:
+            # задача переехала в другую группу/позицию — переставляем строки
+            self._render_list()
+            return
+        self._last_fingerprint = self._fingerprint(self._tasks)
+        row = self._cached_row(updated, self._item_cache)
+        row.update()
 
     def _add_button(self) -> ft.Control:
         return ft.TextButton(
             text="Добавить",
             icon=ft.Icons.ADD,
-            style=ft.ButtonStyle(
-                bgcolor=ft.Colors.with_opacity(0.06, ft.Colors.ON_SURFACE),
-                color=ft.Colors.BLUE_GREY_600,
-                padding=ft.padding.symmetric(vertical=12, horizontal=16),
-                shape=ft.RoundedRectangleBorder(radius=10),
-            ),
+            style=_ADD_BUTTON_STYLE,
             height=46,
             on_click=lambda _: self._open_dialog(),
         )
 
     def _empty_state(self) -> ft.Control:
         return ft.Container(
-            padding=ft.padding.symmetric(vertical=8, horizontal=12),
+            padding=_EMPTY_PADDING,
             content=ft.Row(
                 [
                     ft.Icon(ft.Icons.INFO_OUTLINE, color=ft.Colors.BLUE_GREY_300),
@@ -193,79 +361,25 @@ class DailyTasksPanel:
                 spacing=8,
             ),
             border_radius=8,
-            border=ft.border.all(1, ft.Colors.with_opacity(0.05, ft.Colors.ON_SURFACE)),
+            border=_ITEM_BORDER,
         )
 
     # ---------- Dialogs ----------
-    def _open_dialog(self, task_id: str | None = None):
-        task = None
-        if task_id:
-            for t in self._tasks:
-                if t.id == task_id:
-                    task = t
-                    break
-
-        title_value = task.title if task else ""
-        weekdays_value = task.weekdays if task else (1 << 7) - 1
-
-        title_tf = ft.TextField(label="Название", value=title_value, autofocus=True, max_length=120)
-
-        weekday_checkboxes = []
-        for idx, label in enumerate(WEEKDAY_LABELS):
-            weekday_checkboxes.append(
-                ft.Checkbox(
-                    label=label,
-                    value=bool(weekdays_value & (1 << idx)),
-                    on_change=lambda e: None,
-                )
-            )
-
-        def collect_weekdays() -> int:
-            mask = 0
-            for i, cb in enumerate(weekday_checkboxes):
-                if cb.value:
-                    mask |= 1 << i
-            return mask
-
-        save_btn: ft.TextButton | None = None
-
-        def on_save(_):
-            nonlocal save_btn
-            try:
-                if save_btn:
-                    save_btn.disabled = True
-                title = (title_tf.value or "").strip()
-                if not title:
-                    self.app.toast("Укажите название", ok=False)
-                    return
-
-                mask = collect_weekdays()
-                if mask == 0:
-                    self.app.toast("Выберите хотя бы один день недели", ok=False)
-                    return
-
-                if task:
-                    self.svc.update(task.id, title=title, weekdays=mask)
-                else:
-                    self.svc.create(title=title, weekdays=mask)
-
-                self.refresh()
-                self.app.toast("Сохранено")
-            except Exception as ex:
-                self.app.toast(f"Ошибка: {ex}", ok=False)
-            finally:
-                if save_btn:
-                    save_btn.disabled = False
-                close_alert_dialog(self.app.page)
+    def _build_edit_dialog(self) -> ft.AlertDialog:
+        self._edit_title_tf = ft.TextField(label="Название", autofocus=True, max_length=120)
+        self._edit_weekday_cbs = [ft.Checkbox(label=label) for label in WEEKDAY_LABELS]
+        self._edit_save_btn = ft.FilledButton(
+            "Сохранить", icon=ft.Icons.SAVE, on_click=lambda e: self._run(self._on_save, e)
+        )
 
         dialog_content = ft.Container(
             width=420,
             content=ft.Column(
                 [
-                    title_tf,
+                    self._edit_title_tf,
                     ft.Text("Дни недели", weight=ft.FontWeight.W_600),
                     ft.Row(
-                        controls=weekday_checkboxes,
+                        controls=self._edit_weekday_cbs,
                         wrap=True,
                         spacing=12,
                         run_spacing=8,
@@ -275,44 +389,84 @@ class DailyTasksPanel:
                 tight=True,
             ),
         )
+        return ft.AlertDialog(
+            modal=True,
+            title=ft.Text(),
+            content=dialog_content,
+            actions=[
+                ft.TextButton("Отмена", on_click=lambda e: self.app.close_dialog()),
+                self._edit_save_btn,
+            ],
+            actions_alignment=ft.MainAxisAlignment.END,
+        )
 
-        save_btn = ft.FilledButton("Сохранить", icon=ft.Icons.SAVE, on_click=on_save)
-        actions = [
-            ft.TextButton("Отмена", on_click=lambda e: close_alert_dialog(self.app.page)),
-            save_btn,
-        ]
+    def _open_dialog(self, task_id: str | None = None):
+        task = self._tasks_by_id.get(task_id) if task_id else None
+
+        weekdays_value = task.weekdays if task else (1 << 7) - 1
+        self._editing_task_id = task.id if task else None
+        self._edit_dlg.title.value = "Редактировать задачу" if task else "Новая ежедневная задача"
+        self._edit_title_tf.value = task.title if task else ""
+        for bit, cb in zip(WEEKDAY_BITS, self._edit_weekday_cbs):
+            cb.value = bool(weekdays_value & bit)
+        self._edit_save_btn.disabled = False
 
         self.app.page.snack_bar.open = False
-        open_alert_dialog(
-            self.app.page,
-            title="Редактировать задачу" if task else "Новая ежедневная задача",
-            content=dialog_content,
-            actions=actions,
-        )
+        self.app.show_dialog(self._edit_dlg)
 
-    def _confirm_delete(self, task_id: str):
-        def on_delete(_):
-            try:
-                self.svc.delete(task_id)
-                self.refresh()
-                self.app.toast("Удалено")
-            except Exception as ex:
-                self.app.toast(f"Ошибка: {ex}", ok=False)
-            finally:
-                close_alert_dialog(self.app.page)
-
-        actions = [
-            ft.TextButton("Отмена", on_click=lambda e: close_alert_dialog(self.app.page)),
-            ft.FilledButton("Удалить", icon=ft.Icons.DELETE_OUTLINE, on_click=on_delete),
-        ]
+    def _collect_weekdays(self) -> int:
+        # биты дней не пересекаются, поэтому сумма равна побитовому ИЛИ
+        return sum(bit for bit, cb in zip(WEEKDAY_BITS, self._edit_weekday_cbs) if cb.value)
+
+    async def _on_save(self, _):
+        save_btn = self._edit_save_btn
+        try:
+            save_btn.disabled = True
+            title = (self._edit_title_tf.value or "").strip()
+            if not title:
+                self.app.toast("Укажите название", ok=False)
+                return
+
+            mask = self._collect_weekdays()
+            if mask == 0:
+                self.app.toast("Выберите хотя бы один день недели", ok=False)
+                return
+
+            if self._editing_task_id:
+                await asyncio.to_thread(
+                    self.svc.update, self._editing_task_id, title=title, weekdays=mask
+                )
+            else:
+                await asyncio.to_thread(self.svc.create, title=title, weekdays=mask)
 
+            await self._refresh_async()
+            self.app.toast("Сохранено")
+        except Exception as ex:
+            self.app.toast(f"Ошибка: {ex}", ok=False)
+        finally:
+            save_btn.disabled = False
+            self.app.close_dialog()
+
+    def _confirm_delete(self, task_id: str):
+        self._pending_delete_id = task_id
         self.app.page.snack_bar.open = False
-        open_alert_dialog(
-            self.app.page,
-            title="Удалить задачу?",
-            content=ft.Text("Действие нельзя отменить"),
-            actions=actions,
-        )
+        self.app.show_dialog(self._confirm_dlg)
+
+    async def _on_confirm_delete(self, _):
+        task_id, self._pending_delete_id = self._pending_delete_id, None
+        if task_id is None:
+            self.app.close_dialog()
+            return
+        try:
+            await asyncio.to_thread(self.svc.delete, task_id)
+            # список уже ушёл своим поддеревом — snackbar отправляем отдельно,
+            # без диффа всей страницы; закрытие диалога обновит остальное
+            await self._refresh_async()
+            self.app.toast("Удалено", update_page=False)
+        except Exception as ex:
+            self.app.toast(f"Ошибка: {ex}", ok=False, update_page=False)
+        finally:
+            self.app.close_dialog()
 
     # ---------- Helpers ----------
     def _toast(self, text: str):
@@ -321,21 +475,50 @@ class DailyTasksPanel:
     # ---------- Rollover scheduling ----------
     def _seconds_until_midnight(self) -> float:
         now = datetime.now().astimezone()
-        tomorrow = now.date() + timedelta(days=1)
-        midnight = datetime.combine(tomorrow, datetime.min.time(), tzinfo=now.tzinfo)
+        midnight = datetime.combine(now.date() + _ONE_DAY, _MIDNIGHT, tzinfo=now.tzinfo)
         return max((midnight - now).total_seconds(), 1.0)
 
+    def wake_rollover(self) -> None:
+        """Сверить дату сразу, не дожидаясь конца сна (например, после resume)."""
+        loop, wake = self._rollover_event_loop, self._rollover_wake
+        if loop is None or wake is None:
+            return
+        loop.call_soon_threadsafe(wake.set)
+
     async def _rollover_loop(self):
+        self._rollover_event_loop = asyncio.get_running_loop()
+        self._rollover_wake = wake = asyncio.Event()
         while True:
-            await asyncio.sleep(self._seconds_until_midnight())
             try:
-                self.svc.rollover_if_needed()
-                self._tasks = self.svc.list_all()
+                await asyncio.wait_for(
+                    wake.wait(), timeout=min(self._seconds_until_midnight(), _ROLLOVER_MAX_NAP_SEC)
+                )
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+            if self._last_rollover_date == date.today():
+                # ранний выход из сна (дрейф или очередной кусок) — день тот же
+                continue
+            # не меняем список под открытым диалогом редактирования/удаления
+            while self._edit_dlg.open or self._confirm_dlg.open:
+                await asyncio.sleep(_ROLLOVER_DIALOG_RETRY_SEC)
+            try:
+                # rollover_if_needed пересчитывает статусы на сегодня, поэтому
+                # один прогон покрывает и несколько пропущенных за время сна дней
+                self._set_tasks(await asyncio.to_thread(self._do_rollover))
                 self._render_list()
             except Exception:
                 # Фолбэк на случай ошибок планировщика, чтобы не падало приложение
                 pass
 
+    def dispose(self) -> None:
+        """Остановить цикл rollover (панель больше не показывается)."""
+        task, self._rollover_task = self._rollover_task, None
+        if task is not None and not task.done():
+            task.cancel()
+        self._rollover_wake = None
+        self._rollover_event_loop = None
+
     def _ensure_rollover_timer(self):
         if self._rollover_task and not self._rollover_task.done():
             return
@@ -1,5 +1,10 @@
+import asyncio
+
 import flet as ft
 
+# затемнение под оверлеями — одно значение для всех слоёв
+BACKDROP_COLOR = ft.Colors.with_opacity(0.40, ft.Colors.BLACK)
+
 
 def _has_method(obj, name: str) -> bool:
     try:
@@ -8,6 +13,27 @@ def _has_method(obj, name: str) -> bool:
         return False
 
 
+def schedule_update(page: ft.Page) -> None:
+    """
+    Склеить несколько page.update() за один тик цикла событий в один.
+    Вне цикла (синхронные обработчики Flet идут в потоках) — обновляем сразу.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        page.update()
+        return
+    if getattr(page, "_planner_update_pending", False):
+        return
+    setattr(page, "_planner_update_pending", True)
+
+    def _flush():
+        setattr(page, "_planner_update_pending", False)
+        page.update()
+
+    loop.call_soon(_flush)
+
+
 def open_alert_dialog(
     page: ft.Page,
     *,
@@ -15,14 +41,29 @@ def open_alert_dialog(
     content: ft.Control,
     actions: list[ft.Control],
 ) -> ft.AlertDialog:
-    dlg = ft.AlertDialog(
-        modal=True,
-        title=ft.Text(title),
-        content=content,
-        actions=actions,
-        actions_alignment=ft.MainAxisAlignment.END,
-    )
-
+    # Один экземпляр на страницу: меняем содержимое, а не пересоздаём виджет.
+    # Если он сейчас открыт (диалог поверх диалога) — берём временный новый.
+    dlg = getattr(page, "_planner_cached_dialog", None)
+    if dlg is None or getattr(dlg, "open", False):
+        dlg_new = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(title),
+            actions_alignment=ft.MainAxisAlignment.END,
+        )
+        if dlg is None:
+            setattr(page, "_planner_cached_dialog", dlg_new)
+        dlg = dlg_new
+
+    dlg.title.value = title
+    dlg.content = content
+    dlg.actions = actions
+    # on_dismiss мог остаться от прошлого использования
+    dlg.on_dismiss = None
+    return show_alert_dialog(page, dlg)
+
+
+def show_alert_dialog(page: ft.Page, dlg: ft.AlertDialog) -> ft.AlertDialog:
+    """Показать уже собранный диалог (для переиспользуемых экземпляров)."""
     # Сохраняем ссылку, чтобы close_alert_dialog(page) всегда знал что закрывать
     setattr(page, "_planner_active_dialog", dlg)
 
@@ -38,7 +79,7 @@ def open_alert_dialog(
     else:
         # Фоллбек для старых версий
         dlg.open = True
-        page.update()
+        schedule_update(page)
 
     return dlg
 
@@ -55,7 +96,7 @@ def close_alert_dialog(page: ft.Page):
         except Exception:
             try:
                 dlg.open = False
-                page.update()
+                schedule_update(page)
             except Exception:
                 pass
         return
@@ -63,7 +104,7 @@ def close_alert_dialog(page: ft.Page):
     # Фоллбек
     try:
         dlg.open = False
-        page.update()
+        schedule_update(page)
     except Exception:
         pass
 
@@ -71,20 +112,22 @@ def close_alert_dialog(page: ft.Page):
 def open_overlay(page: ft.Page, content: ft.Control):
     backdrop = ft.Container(
         expand=True,
-        bgcolor=ft.Colors.with_opacity(0.40, ft.Colors.BLACK),
+        bgcolor=BACKDROP_COLOR,
         data="planner_backdrop",
     )
     layer = ft.Stack([backdrop, content], data="planner_layer")
     page.overlay.append(layer)
-    page.update()
+    schedule_update(page)
     return layer
 
 
-def close_overlay(page: ft.Page, layer: ft.Control | None):
+def close_overlay(page: ft.Page, layer: ft.Control | None) -> bool:
     if layer is None:
-        return
+        return False
     try:
         page.overlay.remove(layer)
     except ValueError:
-        pass
-    page.update()
+        # уже закрыт (двойной клик по «Отмена») — обновлять нечего
+        return False
+    schedule_update(page)
+    return True
@@ -2,21 +2,32 @@ from __future__ import annotations
 import flet as ft
 from typing import List, Callable
 
+from ui.dialogs import BACKDROP_COLOR, schedule_update
+
 
 class OverlayManager:
     def __init__(self, page: ft.Page):
         self.page = page
         self._stack: List[Callable[[], None]] = []
+        # id() закрывашек из стека — проверка в pop_if без прохода по списку
+        self._stack_ids: set[int] = set()
+
+        # не затираем уже назначенный обработчик (Esc в AppShell и т.п.):
+        # Esc со своим стеком обрабатываем сами, остальное отдаём дальше
+        prev = page.on_keyboard_event
 
         def on_key(e: ft.KeyboardEvent):
-            if e.key == "Escape" and self._stack:
+            # пустой стек — самый частый случай (обычный набор текста)
+            if self._stack and e.key == "Escape":
                 closer = self._stack[-1]
                 try:
                     closer()
                 finally:
                     if self._stack and self._stack[-1] is closer:
-                        self._stack.pop()
-                self.page.update()
+                        self._pop()
+                schedule_update(self.page)
+            elif prev is not None:
+                prev(e)
 
         self.page.on_keyboard_event = on_key
 
@@ -25,18 +36,18 @@ class OverlayManager:
             if on_close:
                 on_close()
             dialog.open = False
-            self.page.update()
+            schedule_update(self.page)
 
-        self._stack.append(_close)
+        self._push(_close)
         self.page.dialog = dialog
         dialog.on_dismiss = lambda e: self.pop_if(_close)
         dialog.open = True
-        self.page.update()
+        schedule_update(self.page)
 
     def push_overlay(self, ctrl: ft.Control):
         backdrop = ft.Container(
             expand=True,
-            bgcolor=ft.colors.with_opacity(0.40, ft.colors.BLACK),
+            bgcolor=BACKDROP_COLOR,
             data="planner_backdrop",
         )
         layer = ft.Stack([backdrop, ctrl], data="planner_layer")
@@ -48,17 +59,34 @@ class OverlayManager:
             except ValueError:
                 pass
 
-        self._stack.append(_close)
-        self.page.update()
+        self._push(_close)
+        schedule_update(self.page)
         return _close
 
-    def pop_top(self):
+    def pop_top(self) -> bool:
         if not self._stack:
-            return
-        closer = self._stack.pop()
+            return False
+        closer = self._pop()
         closer()
-        self.page.update()
+        schedule_update(self.page)
+        return True
 
-    def pop_if(self, closer: Callable[[], None]):
-        if closer in self._stack:
+    def pop_if(self, closer: Callable[[], None]) -> bool:
+        if id(closer) not in self._stack_ids:
+            return False
+        self._stack_ids.discard(id(closer))
+        if self._stack and self._stack[-1] is closer:
+            # обычно закрывается верхний слой — без поиска по списку
+            self._stack.pop()
+        else:
             self._stack.remove(closer)
+        return True
+
+    def _push(self, closer: Callable[[], None]) -> None:
+        self._stack.append(closer)
+        self._stack_ids.add(id(closer))
+
+    def _pop(self) -> Callable[[], None]:
+        closer = self._stack.pop()
+        self._stack_ids.discard(id(closer))
+        return closer
@@ -1,22 +1,25 @@
 # ui/pages/calendar.py
 from __future__ import annotations
+import asyncio
 import re
+import time
 
-import json
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
 import flet as ft
 from datetime import datetime, date, timedelta, time as dt_time
 from typing import Dict, Tuple, List, Optional
 
 from services.tasks import TaskService
 from core.priorities import (
+    PRIORITY_META,
     priority_options,
     priority_label,
     priority_color,
     priority_bgcolor,
     normalize_priority,
 )
-from core.settings import UI
-from ui.dialogs import close_alert_dialog, open_alert_dialog
+from core.settings import UI, GOOGLE_SYNC
 
 # ===== настройки =====
 CAL_UI = UI.calendar
@@ -24,6 +27,7 @@ THEME = UI.theme
 
 DAY_START = CAL_UI.day_start
 DAY_END = CAL_UI.day_end
+HOURS_PER_DAY = DAY_END - DAY_START + 1
 
 ROW_MIN_H = CAL_UI.row_min_height  # минимальная высота строки часа
 DAY_COL_W = CAL_UI.day_column_width
@@ -40,6 +44,24 @@ IMPORT_NEW_GCAL = CAL_UI.import_new_from_google
 DIALOG_WIDTH_NARROW = CAL_UI.dialog_width_narrow
 DIALOG_WIDTH_WIDE = CAL_UI.dialog_width_wide
 
+VIRTUAL_OVERSCAN_ROWS = CAL_UI.virtual_overscan_rows
+VIEWPORT_FALLBACK_H = 900  # если высота окна ещё неизвестна
+HSCROLL_SYNC_INTERVAL = 0.016  # ~кадр при 60 Гц
+
+# разбор полей даты/времени идёт на каждое нажатие клавиши
+_TIME_RE = re.compile(r"^(\d{1,2}):(\d{2})(?::(\d{2}))?$")
+_TIME_TF_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})(?::\d{2})?\s*$")
+_DATE_TF_RE = re.compile(r"^\s*(\d{1,2})\.(\d{1,2})\.(\d{4})\s*$")
+
+
+def _parse_positive_int(value: Optional[str]) -> Optional[int]:
+    """Целое > 0 из поля ввода; иначе None (без исключений на частом пути)."""
+    s = (value or "").strip()
+    if not (s.isdecimal() and s.isascii()):
+        return None
+    n = int(s)
+    return n if n > 0 else None
+
 
 def _color(value: str, fallback: str = "") -> str:
     try:
@@ -58,7 +80,32 @@ CLR_CHIP_TXT = THEME.chip_text
 CLR_UNS_BG = THEME.unscheduled_bg
 CLR_BACKDROP = THEME.backdrop  # для клика-вне
 
-NOW_ANCHOR_KEY = "now-anchor"
+
+# цвета приоритетов (кроме «без приоритета») — один раз при импорте
+PRIO_BG = {p: priority_bgcolor(p) for p in PRIORITY_META if p > 0}
+PRIO_COLOR = {p: priority_color(p) for p in PRIORITY_META if p > 0}
+
+BADGE_PADDING = ft.padding.symmetric(horizontal=6, vertical=2)
+BADGE_RADIUS = ft.border_radius.all(6)
+HOUR_LABEL_PADDING = ft.padding.only(right=8)
+CHIP_PADDING = ft.padding.only(left=6, right=6, top=4, bottom=4)
+DIALOG_INSET_PADDING = ft.padding.all(16)
+DIALOG_CONTENT_PADDING = ft.padding.all(12)
+
+
+# в ячейке: сначала более приоритетные, затем по названию;
+# сам ключ считается один раз в _task_record
+_chip_sort_key = itemgetter("_sk")
+
+# заготовка записи индекса: copy() + присваивания дешевле литерала на каждую задачу
+_TASK_RECORD_TEMPLATE = {
+    "title": "",
+    "task_id": 0,
+    "duration": 30,
+    "gcal_event_id": None,
+    "priority": 0,
+    "_sk": (0, ""),
+}
 
 
 class CalendarPage:
@@ -73,20 +120,33 @@ class CalendarPage:
     def __init__(self, app):
         self.app = app
         self.svc = TaskService()
-        self._priority_options = [ft.dropdown.Option(key, label) for key, label in priority_options().items()]
+        # подпись/цвета бейджа для каждого приоритета — считаются один раз;
+        # сами контролы общими быть не могут (у контрола Flet один родитель)
+        self._badge_specs: Dict[int, Tuple[str, str, str]] = {
+            p: (priority_label(p, short=True), PRIO_COLOR[p], PRIO_BG[p])
+            for p in PRIO_BG
+        }
 
         self.week_start: date = self._monday_of(date.today())
 
-        # индекс задач: (day_idx, hour) -> [task dicts]
-        self.idx: Dict[Tuple[int, int], List[dict]] = {}
+        # индекс задач: idx[day_idx][hour - DAY_START] -> [task dicts]
+        self.idx: List[List[List[dict]]] = self._empty_index()
         # рассчитанные высоты строк по каждому часу
         self.row_h: Dict[int, int] = {}
+        # где лежит задача в индексе: task_id -> (day_idx, hour)
+        self._task_slots: Dict[int, Tuple[int, int]] = {}
 
         # DnD
         self.current_drag_task_id: Optional[int] = None
 
         # автопрокрутка к «сейчас» после построения
         self._need_scroll_now = True
+        # (неделя, ревизия задач, сегодня) на момент последней сборки сетки
+        self._last_loaded_key = None
+        # задачи из последнего чтения недели/«Без даты» — для диалогов без SQL;
+        # действительны, пока не сменилась ревизия TaskService
+        self._task_cache: Dict[int, object] = {}
+        self._task_cache_rev = -1
 
         # ссылки для синхронизации скролла
         self._hrow_header_ref: ft.Ref[ft.Row] = ft.Ref[ft.Row]()
@@ -95,6 +155,45 @@ class CalendarPage:
 
         # защита от петель при синхронизации скролла
         self._syncing_hscroll = False
+        # не чаще раза в кадр: последнее смещение досылаем таймером
+        self._last_hsync_ts = 0.0
+        self._pending_hsync: Optional[Tuple[ft.Ref, float]] = None
+
+        # виртуализация по вертикали: строятся только часы из окна [lo, hi]
+        # (видимые + запас), выше и ниже — пустые распорки нужной высоты
+        self._row_offsets: List[int] = []  # верх каждого часа; последний — общая высота
+        self._hour_window: Optional[Tuple[int, int]] = None
+        self._hours_col: Optional[ft.Column] = None
+        self._day_col_bodies: List[ft.Column] = []
+        self._top_spacer: Optional[ft.Container] = None
+        self._bottom_spacer: Optional[ft.Container] = None
+        self._grid_days: List[date] = []
+        self._grid_today: Optional[date] = None
+        self._grid_now_hour = -1
+        self._vscroll_px = 0.0
+        # каркас сетки переживает перезагрузки; ячейки окна — кэш по (день, час)
+        # с сигнатурой содержимого, пересобираются только изменившиеся
+        self._grid_root: Optional[ft.Control] = None
+        self._header_cells: List[Tuple[ft.Container, ft.Text, ft.Text]] = []
+        self._cells: Dict[Tuple[int, int], Tuple[tuple, ft.Control]] = {}
+
+        # пикеры диалога редактирования: одни на страницу, в overlay — один раз;
+        # поле, куда писать дату, лежит в data пикера
+        self._edit_dp = ft.DatePicker(
+            first_date=date(2000, 1, 1),
+            last_date=date(2100, 12, 31),
+            on_change=lambda e: self._edit_dp_apply(e.data or e.control.value),
+            on_dismiss=lambda e: self._edit_dp_apply(e.control.value),
+        )
+        self._edit_tp = self._new_time_picker()
+        for picker in (self._edit_dp, self._edit_tp):
+            if picker not in self.app.page.overlay:
+                self.app.page.overlay.append(picker)
+
+        # диалоги планирования/быстрого блока/редактирования — по одному на страницу
+        self._schedule_dlg = self._build_schedule_dialog()
+        self._quick_add_dlg = self._build_quick_add_dialog()
+        self._edit_dlg = self._build_edit_dialog()
 
         # менеджер оверлеев берет на себя фон/ESC
 
@@ -148,9 +247,6 @@ class CalendarPage:
 
     # ===== Диалоги через OverlayManager =====
     def _open_dialog(self, dlg: ft.AlertDialog, on_close=None):
-        if on_close:
-            dlg.on_dismiss = lambda e: on_close()
-
         # аккуратно прячем snackbar, если он есть
         try:
             sb = getattr(self.app.page, "snack_bar", None)
@@ -159,38 +255,18 @@ class CalendarPage:
         except Exception:
             pass
 
-        page = self.app.page
-
-        # чтобы close_alert_dialog() и Esc всегда знали, что закрывать
-        try:
-            setattr(page, "_planner_active_dialog", dlg)
-        except Exception:
-            pass
-        try:
-            page.dialog = dlg
-        except Exception:
-            pass
-
-        # для совместимости со старым поведением (и для Esc-проверки .open)
-        try:
-            dlg.open = True
-        except Exception:
-            pass
-
-        # новый способ показа диалогов (если доступен)
-        if callable(getattr(page, "open", None)):
-            page.open(dlg)
-        else:
-            page.update()
+        # через AppShell: диалог попадает в набор открытых окон, и автообновление
+        # видит его без прохода по page.overlay
+        self.app.show_dialog(dlg, on_close=on_close)
 
     def _close_any_dialog(self):
-        close_alert_dialog(self.app.page)
+        self.app.close_dialog()
     def _delete_task(self, task_id: int):
-        t = self.svc.get(task_id)
+        t = self._get_task(task_id)
         if not t:
             return self._toast("Задача не найдена")
         self.svc.delete(task_id)
-        self.load()
+        self._apply_local_change(task_id, None)
         self._toast("Удалено")
 
 
@@ -216,62 +292,179 @@ class CalendarPage:
     
     # ===== Загрузка =====
     def load(self):
+        if self._load_key() == self._last_loaded_key:
+            # та же неделя, те же данные — ни перестройки, ни сети
+            if self._need_scroll_now:
+                self._need_scroll_now = False
+                self._scroll_to_now()
+            return
+        # сетка рисуется сразу из локальной БД, Google подтягивается в фоне
+        self.reload_local()
+        self._sync_from_google()
+
+    def _load_key(self):
+        return self.week_start, TaskService.revision(), date.today()
+
+    def reload_local(self):
+        """Перестроить неделю только по локальной БД (без сети)."""
         ws = self.week_start
         we = ws + timedelta(days=6)
         self.title_text.value = f"Неделя {ws.strftime('%d.%m')} — {we.strftime('%d.%m.%Y')}"
-        self._sync_from_google(ws, we)
-
 
         # индекс задач за неделю
-        self.idx.clear()
-        for i in range(7):
-            d = ws + timedelta(days=i)
-            for t in self.svc.list_for_day(d):
-                st = getattr(t, "start", None)
-                if not isinstance(st, datetime):
-                    continue
-                dur = getattr(t, "duration_minutes", None) or 30
-                di = (st.date() - ws).days
-                if 0 <= di < 7:
-                    self.idx.setdefault((di, st.hour), []).append(
-                        {
-                            "title": t.title,
-                            "task_id": t.id,
-                            "duration": dur,
-                            "gcal_event_id": getattr(t, "gcal_event_id", None),
-                            "priority": getattr(t, "priority", 0),
-                        }
-                    )
+        self.idx = self._empty_index()
+        self._task_slots.clear()
+        rev = TaskService.revision()
+        week_tasks = self.svc.list_range(ws, we)
+        self._cache_tasks(week_tasks, rev)
+        for t in week_tasks:
+            slot = self._slot_of_task(t)
+            if slot is not None:
+                self.idx[slot[0]][slot[1] - DAY_START].append(self._task_record(t))
+                self._task_slots[t.id] = slot
 
         # высоты строк
-        self.row_h = {}
-        for h in range(DAY_START, DAY_END + 1):
-            max_n = 0
-            for di in range(7):
-                max_n = max(max_n, len(self.idx.get((di, h), [])))
-            height = ROW_MIN_H if max_n <= 0 else max(ROW_MIN_H, CELL_VPAD + max_n * CHIP_EST_H + (max_n - 1) * CHIPS_SPACING)
-            self.row_h[h] = height
+        self.row_h = {h: self._row_height(h) for h in range(DAY_START, DAY_END + 1)}
 
-        for key, tasks in self.idx.items():
-            tasks.sort(key=lambda item: (-item.get("priority", 0), item.get("title", "").lower()))
+        for col in self.idx:
+            for tasks in col:
+                if len(tasks) > 1:
+                    tasks.sort(key=_chip_sort_key)
 
         self._build_unscheduled()
-        self.grid.content = self._build_week_grid()
+        if self._grid_root is None:
+            self.grid.content = self._grid_root = self._build_week_grid()
+        else:
+            self._fill_week_grid()
         self.app.page.update()
+        # ревизия — та, с которой читали неделю: pull, закоммиченный во время
+        # отрисовки, не должен попасть в ключ и скрыть себя от следующего load()
+        self._last_loaded_key = (ws, rev, date.today())
 
         if self._need_scroll_now:
             self._need_scroll_now = False
             self._scroll_to_now()
         self.app.cleanup_overlays()
-    def _sync_from_google(self, ws: date, we: date):
-        try:
-            self.app.sync_service.pull()
-        except Exception as ex:
-            self._toast(f"Google sync: {ex}")
+    def _sync_from_google(self):
+        # pull идёт в рабочем потоке; перерисовка — только если что-то изменилось.
+        # Быстрое листание недель сливается в один запрос (debounce в AppShell).
+        self.app.pull_in_background(self.reload_local)
+
+    # ===== Точечное обновление индекса (без перечитывания недели) =====
+    @staticmethod
+    def _empty_index() -> List[List[List[dict]]]:
+        return [[[] for _ in range(HOURS_PER_DAY)] for _ in range(7)]
+
+    def _task_record(self, t) -> dict:
+        title = t.title
+        priority = getattr(t, "priority", 0)
+        rec = _TASK_RECORD_TEMPLATE.copy()
+        rec["title"] = title
+        rec["task_id"] = t.id
+        rec["duration"] = getattr(t, "duration_minutes", None) or 30
+        rec["gcal_event_id"] = getattr(t, "gcal_event_id", None)
+        rec["priority"] = priority
+        rec["_sk"] = (-(priority or 0), (title or "").lower())
+        return rec
+
+    def _slot_of_task(self, t) -> Optional[Tuple[int, int]]:
+        st = getattr(t, "start", None)
+        if not isinstance(st, datetime) or getattr(t, "status", None) == "done":
+            return None
+        di = (st.date() - self.week_start).days
+        if not (0 <= di < 7 and DAY_START <= st.hour <= DAY_END):
+            # вне недели или вне видимых часов сетки
+            return None
+        return di, st.hour
+
+    def _row_height(self, h: int) -> int:
+        i = h - DAY_START
+        max_n = max(len(col[i]) for col in self.idx)
+        if max_n <= 0:
+            return ROW_MIN_H
+        return max(ROW_MIN_H, CELL_VPAD + max_n * CHIP_EST_H + (max_n - 1) * CHIPS_SPACING)
+
+    def _cache_tasks(self, tasks, rev: int):
+        # rev берётся до запроса: запись во время чтения сделает кэш недействительным
+        if rev != self._task_cache_rev:
+            self._task_cache = {}
+            self._task_cache_rev = rev
+        cache = self._task_cache
+        for t in tasks:
+            cache[t.id] = t
+
+    def _get_task(self, task_id: int):
+        """Задача из кэша страницы; при смене ревизии — заново из БД."""
+        rev = TaskService.revision()
+        if rev == self._task_cache_rev:
+            t = self._task_cache.get(task_id)
+            if t is not None:
+                return t
+        t = self.svc.get(task_id)
+        if t is not None:
+            self._cache_tasks((t,), rev)
+        return t
+
+    def _apply_local_change(self, task_id: int, task=None):
+        """После локальной записи: точечно обновить сетку, изменения — в Google в фоне."""
+        self._patch_index(task_id, task)
+        if GOOGLE_SYNC.auto_push_on_edit:
+            self.app.push_tasks_to_google()
+
+    def _patch_index(self, task_id: int, task=None):
+        """Переложить одну задачу в индексе недели; task=None — задача удалена."""
+        touched: set = set()
+        old = self._task_slots.pop(task_id, None)
+        if old is not None:
+            col = self.idx[old[0]]
+            i = old[1] - DAY_START
+            col[i] = [r for r in col[i] if r["task_id"] != task_id]
+            touched.add(old)
+
+        new = self._slot_of_task(task) if task is not None else None
+        if new is not None:
+            bucket = self.idx[new[0]][new[1] - DAY_START]
+            bucket.append(self._task_record(task))
+            bucket.sort(key=_chip_sort_key)
+            self._task_slots[task_id] = new
+            touched.add(new)
+
+        if old is None or new is None:
+            # задача пришла из «Без даты» или ушла туда/на другую неделю
+            self._build_unscheduled()
+        self._refresh_grid(touched)
+        # индекс снова совпадает с БД — повторный load() ничего не перестроит
+        self._last_loaded_key = self._load_key()
+
+    def _refresh_grid(self, touched):
+        """Перерисовать только затронутые колонки (или окно целиком, если сменились высоты)."""
+        if self._hour_window is None or not self._day_col_bodies:
+            return self.reload_local()
+
+        heights_changed = False
+        for _, h in touched:
+            if DAY_START <= h <= DAY_END:
+                height = self._row_height(h)
+                if height != self.row_h.get(h):
+                    self.row_h[h] = height
+                    heights_changed = True
+
+        if heights_changed:
+            self._rebuild_row_offsets()
+            self._render_hour_range(*self._hour_window)
+        else:
+            lo, hi = self._hour_window
+            for di in {di for di, _ in touched}:
+                d = self._grid_days[di]
+                self._day_col_bodies[di].controls = [self._cell(di, d, h) for h in range(lo, hi + 1)]
+        self.app.page.update()
 
     def _build_unscheduled(self):
         self.unscheduled_list.controls.clear()
-        for t in self.svc.list_unscheduled():
+        rev = TaskService.revision()
+        unscheduled = self.svc.list_unscheduled()
+        self._cache_tasks(unscheduled, rev)
+        for t in unscheduled:
             badge = self._priority_badge(t.priority)
             chip = ft.Container(
                 content=ft.Row(
@@ -280,20 +473,15 @@ class CalendarPage:
                     vertical_alignment=ft.CrossAxisAlignment.CENTER,
                 ),
                 padding=8,
-                bgcolor=priority_bgcolor(t.priority) if t.priority else CLR_UNS_BG,
+                bgcolor=PRIO_BG.get(t.priority, CLR_UNS_BG),
                 border=ft.border.all(0.5, CLR_OUTLINE), border_radius=8,
                 width=SIDE_PANEL_W - 20,
             )
             drag = ft.Draggable(
                 group="task",
                 data=str(t.id),
-                on_drag_start=lambda e, tid=t.id: self._remember_drag(tid),
+                on_drag_start=self._on_drag_start,
                 content=chip,
-                content_feedback=ft.Container(
-                    content=ft.Text(t.title, size=12),
-                    padding=8, bgcolor="#ffffff", border_radius=6,
-                    border=ft.border.all(0.5, CLR_OUTLINE),
-                ),
             )
             self.unscheduled_list.controls.append(drag)
 
@@ -301,73 +489,42 @@ class CalendarPage:
         self.current_drag_task_id = task_id
         self.app.page.update()
 
+    # общие обработчики: параметры берём из control.data, а не из замыканий
+    def _on_drag_start(self, e):
+        self._remember_drag(int(e.control.data))
+
     # ===== Сетка =====
     def _build_week_grid(self) -> ft.Control:
-        days = self._week_days()
-        today = date.today()
-        now = datetime.now()
-
+        """Каркас сетки (один раз); содержимое недели заливает _fill_week_grid."""
         # --- Шапка дней (в собственном viewport) ---
-        header_cells: List[ft.Control] = []
-        for i, d in enumerate(days):
-            header_cells.append(
-                ft.Container(
-                    width=DAY_COL_W, height=HEADER_H,
-                    content=ft.Column(
-                        [ft.Text(d.strftime("%a"), size=14, weight=ft.FontWeight.W_600),
-                         ft.Text(d.strftime("%d.%m"), size=12, color=CLR_TEXTSUB)],
-                        spacing=2, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    alignment=ft.alignment.center,
-                    bgcolor=CLR_TODAY_BG if d == today else None,
-                    border=ft.border.only(right=ft.BorderSide(0.5, CLR_OUTLINE)) if i < 6 else None,
-                )
+        self._header_cells = []
+        for i in range(7):
+            weekday_t = ft.Text(size=14, weight=ft.FontWeight.W_600)
+            date_t = ft.Text(size=12, color=CLR_TEXTSUB)
+            cell = ft.Container(
+                width=DAY_COL_W, height=HEADER_H,
+                content=ft.Column(
+                    [weekday_t, date_t],
+                    spacing=2, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                alignment=ft.alignment.center,
+                border=ft.border.only(right=ft.BorderSide(0.5, CLR_OUTLINE)) if i < 6 else None,
             )
+            self._header_cells.append((cell, weekday_t, date_t))
+        header_cells = [cell for cell, _, _ in self._header_cells]
         hrow_header = ft.Row(controls=header_cells, spacing=0, ref=self._hrow_header_ref, scroll=ft.ScrollMode.ALWAYS)
         header_viewport = ft.Container(  # ограничиваем ширину, чтобы работал скролл
             height=HEADER_H, expand=True, content=hrow_header, clip_behavior=ft.ClipBehavior.HARD_EDGE
         )
 
-        # --- Левый столбец часов (закреплён) ---
-        hours_controls: List[ft.Control] = []
-        for h in range(DAY_START, DAY_END + 1):
-            hours_controls.append(
-                ft.Container(
-                    content=ft.Text(f"{h:02d}:00", size=12, color=CLR_TEXTSUB),
-                    width=HOURS_COL_W, height=self.row_h[h],
-                    alignment=ft.alignment.center_right,
-                    padding=ft.padding.only(right=8),
-                    border=ft.border.only(bottom=ft.BorderSide(0.6, CLR_OUTLINE)),
-                )
-            )
-        hours_col = ft.Column(controls=hours_controls, spacing=0, width=HOURS_COL_W)
-
-        # --- Колонки дней (тело), тоже в viewport по X ---
-        day_cols: List[ft.Control] = []
-        for di, d in enumerate(days):
-            is_today_col = (d == today)
-            col_rows: List[ft.Control] = []
-            for h in range(DAY_START, DAY_END + 1):
-                tasks = self.idx.get((di, h), [])
-                is_now = is_today_col and (h == now.hour)
-                slot = self._slot_body(tasks, is_now, d, h)
-                drop = ft.DragTarget(
-                    group="task",
-                    content=slot,
-                    on_accept=lambda e, _d=d, _h=h: self._on_drop_accept(_d, _h, e),
-                    on_will_accept=lambda e, _slot=slot: self._on_drop_hover(_slot, True),
-                    on_leave=lambda e, _slot=slot: self._on_drop_hover(_slot, False),
-                )
-                cell = ft.Container(
-                    content=drop, width=DAY_COL_W, height=self.row_h[h],
-                    bgcolor=CLR_TODAY_BG if is_today_col else None,
-                    border=ft.border.only(
-                        right=ft.BorderSide(0.5, CLR_OUTLINE) if di < 6 else None,
-                        bottom=ft.BorderSide(0.6, CLR_OUTLINE),
-                    ),
-                )
-                col_rows.append(cell)
-            day_cols.append(ft.Container(content=ft.Column(col_rows, spacing=0), width=DAY_COL_W))
+        # --- виртуализированное тело: часы слева (фикс) и колонки дней ---
+        self._hours_col = ft.Column(spacing=0, width=HOURS_COL_W)
+        self._day_col_bodies = [ft.Column(spacing=0) for _ in range(7)]
+        self._top_spacer = ft.Container(height=0)
+        self._bottom_spacer = ft.Container(height=0)
+        self._vscroll_px = 0.0
+        self._fill_week_grid()
 
+        day_cols = [ft.Container(content=col, width=DAY_COL_W) for col in self._day_col_bodies]
         hrow_body = ft.Row(controls=day_cols, spacing=0, ref=self._hrow_body_ref, scroll=ft.ScrollMode.ALWAYS)
         body_viewport = ft.Container(expand=True, content=hrow_body, clip_behavior=ft.ClipBehavior.HARD_EDGE)
 
@@ -375,10 +532,15 @@ class CalendarPage:
         hrow_header.on_scroll = self._on_header_hscroll
         hrow_body.on_scroll   = self._on_body_hscroll
 
-        # --- вертикальный скролл: часы слева (фикс), тело справа (viewport по X) ---
+        # --- вертикальный скролл: распорка, окно часов, распорка ---
         vscroll_body = ft.Column(
-            controls=[ft.Row([hours_col, body_viewport], spacing=0)],
-            spacing=0, expand=True, scroll=ft.ScrollMode.ALWAYS, ref=self._vcol_ref
+            controls=[
+                self._top_spacer,
+                ft.Row([self._hours_col, body_viewport], spacing=0, vertical_alignment=ft.CrossAxisAlignment.START),
+                self._bottom_spacer,
+            ],
+            spacing=0, expand=True, scroll=ft.ScrollMode.ALWAYS, ref=self._vcol_ref,
+            on_scroll=self._on_vscroll,
         )
 
         # --- финальная сборка ---
@@ -398,33 +560,159 @@ class CalendarPage:
             bgcolor="#fff",
         )
 
+    def _fill_week_grid(self):
+        """Залить неделю в готовый каркас: подписи шапки и видимое окно часов."""
+        days = self._week_days()
+        today = date.today()
+        for (cell, weekday_t, date_t), d in zip(self._header_cells, days):
+            weekday_t.value = d.strftime("%a")
+            date_t.value = d.strftime("%d.%m")
+            cell.bgcolor = CLR_TODAY_BG if d == today else None
+
+        self._rebuild_row_offsets()
+        self._grid_days = days
+        self._grid_today = today
+        self._grid_now_hour = datetime.now().hour
+        start_px = self._now_offset() if self._need_scroll_now else self._vscroll_px
+        self._render_hour_range(*self._hour_window_for(start_px))
+
+    # ----- виртуализация строк-часов -----
+    def _hour_window_for(self, pixels: float) -> Tuple[int, int]:
+        offsets = self._row_offsets
+        viewport_h = getattr(self.app.page, "height", None) or VIEWPORT_FALLBACK_H
+        last_row = len(offsets) - 2
+        first = max(bisect_right(offsets, pixels) - 1, 0)
+        last = min(bisect_left(offsets, pixels + viewport_h), last_row)
+        lo = max(first - VIRTUAL_OVERSCAN_ROWS, 0)
+        hi = min(last + VIRTUAL_OVERSCAN_ROWS, last_row)
+        return DAY_START + lo, DAY_START + hi
+
+    def _rebuild_row_offsets(self):
+        acc = 0
+        self._row_offsets = []
+        for h in range(DAY_START, DAY_END + 1):
+            self._row_offsets.append(acc)
+            acc += self.row_h[h]
+        self._row_offsets.append(acc)
+
+    def _render_hour_range(self, h_lo: int, h_hi: int):
+        offsets = self._row_offsets
+        self._hour_window = (h_lo, h_hi)
+        self._top_spacer.height = offsets[h_lo - DAY_START]
+        self._bottom_spacer.height = offsets[-1] - offsets[h_hi - DAY_START + 1]
+        hours = range(h_lo, h_hi + 1)
+        self._hours_col.controls = [self._hour_label(h) for h in hours]
+        for di, (d, col) in enumerate(zip(self._grid_days, self._day_col_bodies)):
+            col.controls = [self._cell(di, d, h) for h in hours]
+        # ушедшие из окна ячейки сняты с колонок — в кэше держим только видимые
+        stale = [key for key in self._cells if not h_lo <= key[1] <= h_hi]
+        for key in stale:
+            del self._cells[key]
+
+    def _on_vscroll(self, e: ft.OnScrollEvent):
+        self._vscroll_px = e.pixels
+        if not self._row_offsets:
+            return
+        lo, hi = self._hour_window_for(e.pixels)
+        cur = self._hour_window
+        if cur and cur[0] <= lo and hi <= cur[1]:
+            # видимая часть всё ещё внутри построенного окна
+            return
+        self._render_hour_range(lo, hi)
+        col = self._vcol_ref.current
+        if col:
+            col.update()
+
+    def _now_offset(self) -> int:
+        now_h = datetime.now().hour
+        i = min(max(now_h, DAY_START), DAY_END + 1) - DAY_START
+        return self._row_offsets[i] if self._row_offsets else 0
+
+    def _hour_label(self, h: int) -> ft.Control:
+        return ft.Container(
+            content=ft.Text(f"{h:02d}:00", size=12, color=CLR_TEXTSUB),
+            width=HOURS_COL_W, height=self.row_h[h],
+            alignment=ft.alignment.center_right,
+            padding=HOUR_LABEL_PADDING,
+            border=ft.border.only(bottom=ft.BorderSide(0.6, CLR_OUTLINE)),
+        )
+
+    def _cell(self, di: int, d: date, h: int) -> ft.Control:
+        """Ячейка из кэша, если её день, высота и чипы не изменились."""
+        is_today_col = d == self._grid_today
+        sig = (
+            d, self.row_h[h], is_today_col, is_today_col and h == self._grid_now_hour,
+            tuple((r["task_id"], r["title"], r["duration"], r["priority"])
+                  for r in self.idx[di][h - DAY_START]),
+        )
+        cached = self._cells.get((di, h))
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+        cell = self._day_cell(di, d, h)
+        self._cells[(di, h)] = (sig, cell)
+        return cell
+
+    def _day_cell(self, di: int, d: date, h: int) -> ft.Control:
+        is_today_col = (d == self._grid_today)
+        tasks = self.idx[di][h - DAY_START]
+        is_now = is_today_col and (h == self._grid_now_hour)
+        slot = self._slot_body(tasks, is_now, d, h)
+        drop = ft.DragTarget(
+            group="task",
+            content=slot,
+            data=(d, h),
+            on_accept=self._on_cell_drop,
+            on_will_accept=self._on_cell_drag_enter,
+            on_leave=self._on_cell_drag_leave,
+        )
+        return ft.Container(
+            content=drop, width=DAY_COL_W, height=self.row_h[h],
+            bgcolor=CLR_TODAY_BG if is_today_col else None,
+            border=ft.border.only(
+                right=ft.BorderSide(0.5, CLR_OUTLINE) if di < 6 else None,
+                bottom=ft.BorderSide(0.6, CLR_OUTLINE),
+            ),
+        )
+
     # синхронизация горизонтального скролла (без «рывков»)
     def _on_body_hscroll(self, e: ft.OnScrollEvent):
-        if self._syncing_hscroll:
-            return
-        try:
-            self._syncing_hscroll = True
-            hdr = self._hrow_header_ref.current
-            if hdr:
-                hdr.scroll_to(offset=e.pixels, duration=0)
-        finally:
-            self._syncing_hscroll = False
+        self._queue_hsync(self._hrow_header_ref, e.pixels)
 
     def _on_header_hscroll(self, e: ft.OnScrollEvent):
+        self._queue_hsync(self._hrow_body_ref, e.pixels)
+
+    def _queue_hsync(self, target_ref: ft.Ref, pixels: float):
         if self._syncing_hscroll:
             return
+        if time.monotonic() - self._last_hsync_ts >= HSCROLL_SYNC_INTERVAL:
+            self._apply_hsync(target_ref, pixels)
+            return
+        # частые события колеса/тачпада: запоминаем последнее, шлём одно
+        first = self._pending_hsync is None
+        self._pending_hsync = (target_ref, pixels)
+        if first:
+            self.app.page.run_task(self._flush_hsync)
+
+    async def _flush_hsync(self):
+        await asyncio.sleep(HSCROLL_SYNC_INTERVAL)
+        pending, self._pending_hsync = self._pending_hsync, None
+        if pending:
+            self._apply_hsync(*pending)
+
+    def _apply_hsync(self, target_ref: ft.Ref, pixels: float):
+        self._last_hsync_ts = time.monotonic()
+        target = target_ref.current
+        if not target:
+            return
         try:
             self._syncing_hscroll = True
-            body = self._hrow_body_ref.current
-            if body:
-                body.scroll_to(offset=e.pixels, duration=0)
+            target.scroll_to(offset=pixels, duration=0)
         finally:
             self._syncing_hscroll = False
 
     def _slot_body(self, tasks: List[dict], is_now_hour: bool, day: date, hour: int) -> ft.Control:
         chips: List[ft.Control] = []
         if is_now_hour:
-            chips.append(ft.Container(key=NOW_ANCHOR_KEY, height=1, width=1))
             chips.append(ft.Container(height=2, bgcolor=CLR_NOW_LINE))
 
         if tasks:
@@ -434,7 +722,8 @@ class CalendarPage:
             # кликабельная площадь заполняет весь слот по высоте
             chips.append(
                 ft.Container(
-                    on_click=lambda e, d=day, h=hour: self.open_quick_add(d, h),
+                    data=(day, hour),
+                    on_click=self._on_empty_slot_click,
                     width=DAY_COL_W,
                     height=max(8, self.row_h.get(hour, ROW_MIN_H) - 8),
                 )
@@ -442,7 +731,7 @@ class CalendarPage:
 
         return ft.Container(
             content=ft.Column(chips, spacing=CHIPS_SPACING),
-            padding=ft.padding.only(left=6, right=6, top=4, bottom=4),
+            padding=CHIP_PADDING,
             width=DAY_COL_W, expand=True,
             bgcolor=CLR_SURFVAR if tasks else None,
         )
@@ -468,32 +757,40 @@ class CalendarPage:
                 spacing=6,
                 vertical_alignment=ft.CrossAxisAlignment.CENTER,
             ),
-            bgcolor=priority_bgcolor(priority) if priority else CLR_CHIP,
+            bgcolor=PRIO_BG.get(priority, CLR_CHIP),
             border=ft.border.all(0.5, CLR_OUTLINE),
             border_radius=8,
             padding=6, width=DAY_COL_W-12,
         )
         gd = ft.GestureDetector(
             content=chip_body,
-            on_tap=lambda e, _tid=tid: self._open_edit_dialog(_tid, title, dur),
-            on_secondary_tap=lambda e, _tid=tid, _title=title, _dur=dur, _d=day, _h=hour:
-                self._open_chip_menu(_tid, _title, _dur, _d, _h),
+            data=(tid, title, dur, day, hour),
+            on_tap=self._on_chip_tap,
+            on_secondary_tap=self._on_chip_secondary_tap,
         )
         return ft.Draggable(
             group="task",
             data=str(tid),
-            on_drag_start=lambda e, t_id=tid: self._remember_drag(t_id),
+            on_drag_start=self._on_drag_start,
+            # без content_feedback: под курсором рисуется сам чип,
+            # отдельное дерево контролов на каждый чип не строим
             content=gd,
-            content_feedback=ft.Container(
-                content=ft.Text(title, size=12),
-                padding=8, bgcolor="#ffffff", border_radius=6, border=ft.border.all(0.5, CLR_OUTLINE),
-            ),
         )
 
+    def _on_chip_tap(self, e):
+        tid, title, dur, _, _ = e.control.data
+        self._open_edit_dialog(tid, title, dur)
+
+    def _on_chip_secondary_tap(self, e):
+        self._open_chip_menu(*e.control.data)
+
+    def _on_empty_slot_click(self, e):
+        self.open_quick_add(*e.control.data)
+
     # ===== Контекстное меню чипа =====
     def _open_chip_menu(self, task_id: int, title: str, duration: int, day: date, hour: int):
         def close(_=None):
-            close_alert_dialog(self.app.page)
+            self._close_any_dialog()
 
         def act_edit(_):
             close(); self._open_edit_dialog(task_id, title, duration)
@@ -533,21 +830,24 @@ class CalendarPage:
     def _on_drop_accept(self, day: date, hour: int, e):
         task_id = self.current_drag_task_id
         if task_id is None:
+            # Draggable всегда несёт id задачи строкой (data=str(task.id))
             s = str(e.data or "").strip()
-            if s.isdigit():
-                task_id = int(s)
-            else:
-                try:
-                    payload = json.loads(s)
-                    if isinstance(payload, dict) and "task_id" in payload:
-                        task_id = int(payload["task_id"])
-                except Exception:
-                    task_id = None
+            task_id = int(s) if s.isdecimal() and s.isascii() else None
         self.current_drag_task_id = None
         if task_id is None:
             return self._toast("Не удалось определить задачу")
         self._schedule_task(task_id, day, hour)
 
+    def _on_cell_drop(self, e):
+        day, hour = e.control.data
+        self._on_drop_accept(day, hour, e)
+
+    def _on_cell_drag_enter(self, e):
+        return self._on_drop_hover(e.control.content, True)
+
+    def _on_cell_drag_leave(self, e):
+        self._on_drop_hover(e.control.content, False)
+
     def _on_drop_hover(self, slot: ft.Control, active: bool):
         try:
             if isinstance(slot, ft.Container):
@@ -561,295 +861,197 @@ class CalendarPage:
             return True
 
     # ===== Планирование и быстрый блок =====
-    def _schedule_task(self, task_id: int, day: date, hour: int):
-        start_dt = datetime(day.year, day.month, day.day, hour, 0, 0)
-        task = self.svc.get(task_id)
-        if not task:
-            return self._toast("Задача не найдена")
-        dur_value = task.duration_minutes or 30
-        dur_tf = ft.TextField(label="Длительность, мин", value=str(dur_value), width=140)
-        priority_dd = ft.Dropdown(
+    # Диалоги собираются один раз; при открытии меняются только значения
+    # полей, а задача/время текущего открытия лежат в dlg.data.
+    def _priority_dropdown(self, width: int) -> ft.Dropdown:
+        # у каждого выпадающего списка свои Option: у контрола один родитель
+        return ft.Dropdown(
             label="Приоритет",
-            width=220,
-            value=str(getattr(task, "priority", 0)),
-            options=self._priority_options,
+            width=width,
+            options=[ft.dropdown.Option(key, label) for key, label in priority_options().items()],
         )
-        save_btn: ft.Control | None = None
-
-        def on_save(_):
-            nonlocal save_btn
-            try:
-                if save_btn:
-                    save_btn.disabled = True
-                duration = int(dur_tf.value)
-                if duration <= 0:
-                    self.app.toast("Длительность должна быть > 0", ok=False)
-                    return
 
-                priority = normalize_priority(priority_dd.value)
-
-                self.svc.update(
-                    task_id,
-                    start=start_dt,
-                    duration_minutes=duration,
-                    priority=priority,
-                )
-
-                self.load()
-                self.app.toast("Сохранено")
-            except Exception as ex:
-                self.app.toast(f"Ошибка: {ex}", ok=False)
-            finally:
-                if save_btn:
-                    save_btn.disabled = False
-                close_alert_dialog(self.app.page)
-
-        def on_cancel(_):
-            close_alert_dialog(self.app.page)
-
-        dlg = ft.AlertDialog(
+    def _build_schedule_dialog(self) -> ft.AlertDialog:
+        self._sched_dur_tf = ft.TextField(label="Длительность, мин", width=140)
+        self._sched_priority_dd = self._priority_dropdown(220)
+        self._sched_save_btn = ft.FilledButton("Сохранить", icon=ft.Icons.SAVE, on_click=self._on_schedule_save)
+        return ft.AlertDialog(
             modal=True,
-            inset_padding=ft.padding.all(16),
-            content_padding=ft.padding.all(12),
-            title=ft.Text(f"Запланировать — {start_dt.strftime('%a, %d.%m %H:00')}"),
+            inset_padding=DIALOG_INSET_PADDING,
+            content_padding=DIALOG_CONTENT_PADDING,
+            title=ft.Text(),
             content=ft.Container(
                 width=DIALOG_WIDTH_NARROW,
-                content=ft.Column([dur_tf, priority_dd], spacing=12, tight=True),
+                content=ft.Column([self._sched_dur_tf, self._sched_priority_dd], spacing=12, tight=True),
             ),
             actions=[
-                ft.TextButton("Отмена", on_click=on_cancel),
-                ft.FilledButton("Сохранить", icon=ft.Icons.SAVE, on_click=on_save),
+                ft.TextButton("Отмена", on_click=lambda e: self._close_any_dialog()),
+                self._sched_save_btn,
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
 
-        save_btn = dlg.actions[1]
-
+    def _schedule_task(self, task_id: int, day: date, hour: int):
+        start_dt = datetime(day.year, day.month, day.day, hour, 0, 0)
+        task = self._get_task(task_id)
+        if not task:
+            return self._toast("Задача не найдена")
+        dlg = self._schedule_dlg
+        dlg.data = {"task_id": task_id, "start": start_dt}
+        dlg.title.value = f"Запланировать — {start_dt.strftime('%a, %d.%m %H:00')}"
+        self._sched_dur_tf.value = str(task.duration_minutes or 30)
+        self._sched_priority_dd.value = str(getattr(task, "priority", 0))
+        self._sched_save_btn.disabled = False
         self._open_dialog(dlg)
 
-    def open_quick_add(self, day: date, hour: int):
-        start_dt = datetime(day.year, day.month, day.day, hour, 0, 0)
-        title_tf = ft.TextField(label="Название", width=DIALOG_WIDTH_NARROW - 40)
-        dur_tf = ft.TextField(label="Длительность, мин", value="30", width=140)
-        priority_dd = ft.Dropdown(
-            label="Приоритет",
-            width=180,
-            value=str(0),
-            options=self._priority_options,
-        )
-        save_btn: ft.Control | None = None
+    def _on_schedule_save(self, _):
+        data = self._schedule_dlg.data or {}
+        task_id = data.get("task_id")
+        save_btn = self._sched_save_btn
+        try:
+            save_btn.disabled = True
+            duration = _parse_positive_int(self._sched_dur_tf.value)
+            if duration is None:
+                self.app.toast("Длительность должна быть > 0", ok=False)
+                return
+
+            priority = normalize_priority(self._sched_priority_dd.value)
+
+            updated = self.svc.update(
+                task_id,
+                start=data.get("start"),
+                duration_minutes=duration,
+                priority=priority,
+            )
 
-        def on_save(_):
-            nonlocal save_btn
-            try:
-                if save_btn:
-                    save_btn.disabled = True
-                title = (title_tf.value or "").strip()
-                if not title:
-                    self.app.toast("Введите название", ok=False)
-                    return
-                try:
-                    duration = int(dur_tf.value)
-                    if duration <= 0:
-                        raise ValueError
-                except Exception:
-                    self.app.toast("Длительность должна быть > 0", ok=False)
-                    return
-                priority = normalize_priority(priority_dd.value)
-
-                self.svc.add(title=title, start=start_dt, duration_minutes=duration, priority=priority)
-                self.app.toast("Создано")
-                self.load()
-            except Exception as ex:
-                self.app.toast(f"Ошибка: {ex}", ok=False)
-            finally:
-                if save_btn:
-                    save_btn.disabled = False
-                close_alert_dialog(self.app.page)
-
-        def on_cancel(_):
-            close_alert_dialog(self.app.page)
-
-        dlg = ft.AlertDialog(
+            self._apply_local_change(task_id, updated)
+            self.app.toast("Сохранено")
+        except Exception as ex:
+            self.app.toast(f"Ошибка: {ex}", ok=False)
+        finally:
+            save_btn.disabled = False
+            self._close_any_dialog()
+
+    def _build_quick_add_dialog(self) -> ft.AlertDialog:
+        self._quick_title_tf = ft.TextField(label="Название", width=DIALOG_WIDTH_NARROW - 40)
+        self._quick_dur_tf = ft.TextField(label="Длительность, мин", width=140)
+        self._quick_priority_dd = self._priority_dropdown(180)
+        self._quick_save_btn = ft.FilledButton("Сохранить", icon=ft.Icons.SAVE, on_click=self._on_quick_add_save)
+        return ft.AlertDialog(
             modal=True,
-            inset_padding=ft.padding.all(16),
-            content_padding=ft.padding.all(12),
-            title=ft.Text(f"Быстрый блок — {start_dt.strftime('%a, %d.%m %H:00')}"),
+            inset_padding=DIALOG_INSET_PADDING,
+            content_padding=DIALOG_CONTENT_PADDING,
+            title=ft.Text(),
             content=ft.Container(
                 width=DIALOG_WIDTH_NARROW,
-                content=ft.Column([title_tf, dur_tf, priority_dd], spacing=12, tight=True),
+                content=ft.Column(
+                    [self._quick_title_tf, self._quick_dur_tf, self._quick_priority_dd],
+                    spacing=12,
+                    tight=True,
+                ),
             ),
             actions=[
-                ft.TextButton("Отмена", on_click=on_cancel),
-                ft.FilledButton("Сохранить", icon=ft.Icons.SAVE, on_click=on_save),
+                ft.TextButton("Отмена", on_click=lambda e: self._close_any_dialog()),
+                self._quick_save_btn,
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
-        save_btn = dlg.actions[1]
+
+    def open_quick_add(self, day: date, hour: int):
+        start_dt = datetime(day.year, day.month, day.day, hour, 0, 0)
+        dlg = self._quick_add_dlg
+        dlg.data = {"start": start_dt}
+        dlg.title.value = f"Быстрый блок — {start_dt.strftime('%a, %d.%m %H:00')}"
+        self._quick_title_tf.value = ""
+        self._quick_dur_tf.value = "30"
+        self._quick_priority_dd.value = str(0)
+        self._quick_save_btn.disabled = False
         self._open_dialog(dlg)
 
-    # ===== Редактирование / Snooze / Удаление =====
-    # ui/pages/calendar.py  (внутри класса CalendarPage)
-    def _open_edit_dialog(
-        self,
-        task_id: int,
-        current_title: str | None = None,
-        current_duration: int | None = None,
-    ):
-        # --- берём актуальные данные задачи ---
-        t = None
+    def _on_quick_add_save(self, _):
+        data = self._quick_add_dlg.data or {}
+        save_btn = self._quick_save_btn
         try:
-            t = self.svc.get(task_id)
-        except Exception:
-            pass
-        if t is None:
-            return self._toast("Задача не найдена")
-
-        title_init = current_title if current_title is not None else (t.title or "")
-        dur_init   = current_duration if current_duration is not None else (t.duration_minutes or 30)
-        start_init = getattr(t, "start", None)
-
-        date_str = start_init.strftime("%d.%m.%Y") if isinstance(start_init, datetime) else ""
-        time_str = start_init.strftime("%H:%M")     if isinstance(start_init, datetime) else ""
+            save_btn.disabled = True
+            title = (self._quick_title_tf.value or "").strip()
+            if not title:
+                self.app.toast("Введите название", ok=False)
+                return
+            duration = _parse_positive_int(self._quick_dur_tf.value)
+            if duration is None:
+                self.app.toast("Длительность должна быть > 0", ok=False)
+                return
+            priority = normalize_priority(self._quick_priority_dd.value)
+
+            created = self.svc.add(
+                title=title, start=data.get("start"), duration_minutes=duration, priority=priority
+            )
+            self.app.toast("Создано")
+            self._apply_local_change(created.id, created)
+        except Exception as ex:
+            self.app.toast(f"Ошибка: {ex}", ok=False)
+        finally:
+            save_btn.disabled = False
+            self._close_any_dialog()
 
+    # ===== Редактирование / Snooze / Удаление =====
+    def _build_edit_dialog(self) -> ft.AlertDialog:
         # --- поля формы (без expand) ---
         DATE_W, TIME_W, DUR_W = 140, 100, 120
 
-        title_tf = ft.TextField(label="Название", value=title_init, width=DIALOG_WIDTH_WIDE - 80)
-        date_tf  = ft.TextField(label="Дата",  value=date_str, width=DATE_W, read_only=True)
-        time_tf  = ft.TextField(label="Время", value=time_str, width=TIME_W, read_only=True)
-        dur_tf   = ft.TextField(label="Длительность, мин", value=str(dur_init), width=DUR_W)
-        priority_dd = ft.Dropdown(
-            label="Приоритет",
-            width=200,
-            value=str(getattr(t, "priority", 0)),
-            options=self._priority_options,
-        )
+        self._edit_title_tf = ft.TextField(label="Название", width=DIALOG_WIDTH_WIDE - 80)
+        self._edit_date_tf = ft.TextField(label="Дата", width=DATE_W, read_only=True)
+        self._edit_time_tf = ft.TextField(label="Время", width=TIME_W, read_only=True)
+        self._edit_dur_tf = ft.TextField(label="Длительность, мин", width=DUR_W)
+        self._edit_priority_dd = self._priority_dropdown(200)
 
         # заметки (авто-увеличение по числу строк)
-        notes_tf = ft.TextField(
+        self._edit_notes_tf = ft.TextField(
             label="Заметки",
-            value=(t.notes or ""),
             multiline=True,
             min_lines=3,
             max_lines=6,
+            on_change=self._edit_notes_autogrow,
         )
-        def _autogrow(_=None):
-            s = notes_tf.value or ""
-            # считаем количество визуальных строк (по \n)
-            lines = max(3, min(12, s.count("\n") + 1))
-            if notes_tf.max_lines != lines:
-                notes_tf.max_lines = lines
-                self.app.page.update()
-        notes_tf.on_change = _autogrow
-        _autogrow()  # подстроиться под начальный текст
-
-        # --- пикеры ---
-        dp = ft.DatePicker(
-            first_date=date(2000, 1, 1),
-            last_date=date(2100, 12, 31),
-            on_change=lambda e: self._set_tf_date(date_tf, e.data or e.control.value),
-            on_dismiss=lambda e: self._set_tf_date(date_tf, e.control.value),
-        )
-        tp = self._new_time_picker()
-        for p in (dp, tp):
-            if p not in self.app.page.overlay:
-                self.app.page.overlay.append(p)
 
         date_btn = ft.IconButton(
             icon=ft.Icons.CALENDAR_MONTH,
             tooltip="Выбрать дату",
             icon_size=18,
-            on_click=lambda e, _dp=dp: self.app.page.open(_dp),
+            on_click=lambda e: self.app.page.open(self._edit_dp),
         )
         time_btn = ft.IconButton(
             icon=ft.Icons.SCHEDULE,
             tooltip="Выбрать время",
             icon_size=18,
-            on_click=lambda e, _tp=tp: self._open_time_picker(_tp, time_tf),
+            on_click=lambda e: self._open_time_picker(self._edit_tp, self._edit_time_tf),
         )
 
-        # --- сохранение / отмена ---
-        def _remove_pickers():
-            for ctrl in (dp, tp):
-                try:
-                    ctrl.open = False
-                except Exception:
-                    pass
-                try:
-                    if ctrl in self.app.page.overlay:
-                        self.app.page.overlay.remove(ctrl)
-                except Exception:
-                    pass
-
-        save_btn: ft.Control | None = None
-
-        def on_save(_):
-            nonlocal save_btn
-            try:
-                if save_btn:
-                    save_btn.disabled = True
-                new_title = (title_tf.value or "").strip()
-                if not new_title:
-                    self.app.toast("Введите название", ok=False)
-                    return
-
-                if date_tf.value and self._parse_date_tf(date_tf.value) is None:
-                    self.app.toast("Неверный формат даты. Пример: 10.10.2025", ok=False)
-                    return
-                if time_tf.value and self._parse_time_tf(time_tf.value) is None:
-                    self.app.toast("Неверный формат времени. Пример: 09:30", ok=False)
-                    return
-
-                new_start = self._combine_dt(date_tf.value, time_tf.value)
-                try:
-                    new_dur = int(dur_tf.value) if dur_tf.value.strip() else None
-                except ValueError:
-                    self.app.toast("Длительность должна быть числом (мин)", ok=False)
-                    return
-
-                self.svc.update(
-                    task_id,
-                    title=new_title,
-                    notes=notes_tf.value,
-                    start=new_start,
-                    duration_minutes=new_dur,
-                    priority=normalize_priority(priority_dd.value),
-                )
-
-                self.load()
-                self.app.toast("Сохранено")
-            except Exception as ex:
-                self.app.toast(f"Ошибка: {ex}", ok=False)
-            finally:
-                if save_btn:
-                    save_btn.disabled = False
-                close_alert_dialog(self.app.page)
-
-        def on_cancel(_=None):
-            close_alert_dialog(self.app.page)
-
         # --- компактная вёрстка (без Wrap) ---
         utils_row = ft.Row(
-            [date_tf, date_btn, time_tf, time_btn, dur_tf, priority_dd],
+            [
+                self._edit_date_tf, date_btn, self._edit_time_tf, time_btn,
+                self._edit_dur_tf, self._edit_priority_dd,
+            ],
             spacing=8,
             vertical_alignment=ft.CrossAxisAlignment.END,
         )
+        self._edit_save_btn = ft.FilledButton("Сохранить", icon=ft.Icons.SAVE, on_click=self._on_edit_save)
         buttons_row = ft.Row(
-            [ft.TextButton("Отмена", on_click=on_cancel),
-            ft.FilledButton("Сохранить", icon=ft.Icons.SAVE, on_click=on_save)],
+            [ft.TextButton("Отмена", on_click=lambda e: self._close_any_dialog()),
+            self._edit_save_btn],
             alignment=ft.MainAxisAlignment.END,
         )
 
-        dlg = ft.AlertDialog(
+        return ft.AlertDialog(
             modal=True,
-            inset_padding=ft.padding.all(16),
-            content_padding=ft.padding.all(12),
+            inset_padding=DIALOG_INSET_PADDING,
+            content_padding=DIALOG_CONTENT_PADDING,
             title=ft.Text("Редактировать задачу"),
             content=ft.Container(
                 width=DIALOG_WIDTH_WIDE,
                 content=ft.Column(
-                    [title_tf, utils_row, notes_tf, buttons_row],
+                    [self._edit_title_tf, utils_row, self._edit_notes_tf, buttons_row],
                     spacing=10,
                     tight=True,
                     scroll=ft.ScrollMode.ADAPTIVE,
@@ -857,10 +1059,100 @@ class CalendarPage:
             ),
         )
 
-        save_btn = buttons_row.controls[1]
-        self._open_dialog(dlg, on_close=_remove_pickers)
+    # ui/pages/calendar.py  (внутри класса CalendarPage)
+    def _open_edit_dialog(
+        self,
+        task_id: int,
+        current_title: str | None = None,
+        current_duration: int | None = None,
+    ):
+        # --- берём актуальные данные задачи ---
+        t = None
+        try:
+            t = self._get_task(task_id)
+        except Exception:
+            pass
+        if t is None:
+            return self._toast("Задача не найдена")
 
+        title_init = current_title if current_title is not None else (t.title or "")
+        dur_init   = current_duration if current_duration is not None else (t.duration_minutes or 30)
+        start_init = getattr(t, "start", None)
 
+        self._edit_title_tf.value = title_init
+        self._edit_date_tf.value = start_init.strftime("%d.%m.%Y") if isinstance(start_init, datetime) else ""
+        self._edit_time_tf.value = start_init.strftime("%H:%M")     if isinstance(start_init, datetime) else ""
+        self._edit_dur_tf.value = str(dur_init)
+        self._edit_priority_dd.value = str(getattr(t, "priority", 0))
+        self._edit_notes_tf.value = t.notes or ""
+        # подстроиться под начальный текст; отрисуется вместе с диалогом
+        self._edit_notes_autogrow(push=False)
+        self._edit_save_btn.disabled = False
+
+        # дата из пикера — в поле этого диалога
+        self._edit_dp.data = self._edit_date_tf
+        dlg = self._edit_dlg
+        dlg.data = {"task_id": task_id}
+        self._open_dialog(dlg, on_close=self._close_edit_pickers)
+
+    def _edit_notes_autogrow(self, _=None, *, push=True):
+        notes_tf = self._edit_notes_tf
+        s = notes_tf.value or ""
+        # считаем количество визуальных строк (по \n)
+        lines = max(3, min(12, s.count("\n") + 1))
+        if notes_tf.max_lines != lines:
+            notes_tf.max_lines = lines
+            if push:
+                notes_tf.update()
+
+    def _close_edit_pickers(self):
+        for ctrl in (self._edit_dp, self._edit_tp):
+            ctrl.open = False
+            ctrl.data = None
+
+    def _on_edit_save(self, _):
+        task_id = (self._edit_dlg.data or {}).get("task_id")
+        date_tf, time_tf, dur_tf = self._edit_date_tf, self._edit_time_tf, self._edit_dur_tf
+        save_btn = self._edit_save_btn
+        try:
+            save_btn.disabled = True
+            new_title = (self._edit_title_tf.value or "").strip()
+            if not new_title:
+                self.app.toast("Введите название", ok=False)
+                return
+
+            if date_tf.value and self._parse_date_tf(date_tf.value) is None:
+                self.app.toast("Неверный формат даты. Пример: 10.10.2025", ok=False)
+                return
+            if time_tf.value and self._parse_time_tf(time_tf.value) is None:
+                self.app.toast("Неверный формат времени. Пример: 09:30", ok=False)
+                return
+
+            new_start = self._combine_dt(date_tf.value, time_tf.value)
+            # пустое поле — длительность не задана
+            new_dur = None
+            if (dur_tf.value or "").strip():
+                new_dur = _parse_positive_int(dur_tf.value)
+                if new_dur is None:
+                    self.app.toast("Длительность должна быть числом (мин)", ok=False)
+                    return
+
+            updated = self.svc.update(
+                task_id,
+                title=new_title,
+                notes=self._edit_notes_tf.value,
+                start=new_start,
+                duration_minutes=new_dur,
+                priority=normalize_priority(self._edit_priority_dd.value),
+            )
+
+            self._apply_local_change(task_id, updated)
+            self.app.toast("Сохранено")
+        except Exception as ex:
+            self.app.toast(f"Ошибка: {ex}", ok=False)
+        finally:
+            save_btn.disabled = False
+            self._close_any_dialog()
 
     def _snooze_minutes(self, task_id: int, day: date, hour: int, duration: int, add_minutes: int):
         base = datetime(day.year, day.month, day.day, hour, 0, 0) + timedelta(minutes=add_minutes)
@@ -878,19 +1170,16 @@ class CalendarPage:
         self._reschedule(task_id, base, 30)
 
     def _reschedule(self, task_id: int, start_dt: datetime, duration: int):
-        self.svc.update(task_id, start=start_dt, duration_minutes=duration)
-        self.load()
+        updated = self.svc.update(task_id, start=start_dt, duration_minutes=duration)
+        self._apply_local_change(task_id, updated)
 
     # ===== автопрокрутка к сегодняшнему дню и текущему часу =====
     def _scroll_to_now(self):
         # вертикаль
         try:
-            now = datetime.now()
-            top_offset = 0
-            for h in range(DAY_START, min(now.hour, DAY_END + 1)):
-                top_offset += self.row_h.get(h, 0)
             if self._vcol_ref.current:
-                self._vcol_ref.current.scroll_to(offset=top_offset, duration=300)
+                # смещение берём из префиксных сумм высот, без якоря-ключа в сетке
+                self._vcol_ref.current.scroll_to(offset=self._now_offset(), duration=300)
         except Exception:
             pass
 
@@ -911,6 +1200,11 @@ class CalendarPage:
         self._scroll_to_now()
 
     # ===== Вспомогательное для форм =====
+    def _edit_dp_apply(self, value):
+        tf = self._edit_dp.data
+        if tf is not None:
+            self._set_tf_date(tf, value)
+
     def _new_time_picker(self) -> ft.TimePicker:
         picker = ft.TimePicker(help_text="Выберите время")
         picker.on_change = lambda e, _picker=picker: self._time_picker_on_change(_picker, e)
@@ -957,7 +1251,7 @@ class CalendarPage:
             data["applied"] = True
         elif not data.get("applied"):
             tf.value = data.get("prev", tf.value)
-            self.app.page.update()
+            tf.update()
         picker.data = None
 
     def _set_tf_date(self, tf: ft.TextField, value):
@@ -982,30 +1276,31 @@ class CalendarPage:
                         tf.value = s
                     except ValueError:
                         return
-        self.app.page.update()
+        # меняется только поле — отправляем его, а не всю страницу
+        tf.update()
 
     def _set_tf_time(self, tf: ft.TextField, value):
         if value in (None, ""):
             return
         try:
             tf.value = value.strftime("%H:%M")
-            self.app.page.update()
+            tf.update()
             return
         except Exception:
             pass
 
         s = str(value or "").strip()
-        m = re.match(r"^(\d{1,2}):(\d{2})(?::(\d{2}))?$", s)
+        m = _TIME_RE.match(s)
         if m:
             h = int(m.group(1))
             mm = int(m.group(2))
             if 0 <= h <= 23 and 0 <= mm <= 59:
                 tf.value = f"{h:02d}:{mm:02d}"
-        self.app.page.update()
+        tf.update()
 
     def _parse_date_tf(self, s: str):
         s = (s or "").strip()
-        m = re.match(r"^\s*(\d{1,2})\.(\d{1,2})\.(\d{4})\s*$", s)
+        m = _DATE_TF_RE.match(s)
         if not m:
             return None
         d, mth, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
@@ -1016,7 +1311,7 @@ class CalendarPage:
 
     def _parse_time_tf(self, s: str):
         s = (s or "").strip()
-        m = re.match(r"^\s*(\d{1,2}):(\d{2})(?::\d{2})?\s*$", s)
+        m = _TIME_TF_RE.match(s)
         if not m:
             return None
         h, minute = int(m.group(1)), int(m.group(2))
@@ -1049,20 +1344,18 @@ class CalendarPage:
 
     # ===== сервис =====
     def _priority_badge(self, priority: int) -> ft.Control:
-        if priority <= 0:
+        spec = self._badge_specs.get(priority)
+        if spec is None:
             return ft.Container(width=0)
+        label, color, bgcolor = spec
         return ft.Container(
-            content=ft.Text(
-                priority_label(priority, short=True),
-                size=10,
-                weight=ft.FontWeight.W_500,
-                color=priority_color(priority),
-            ),
-            bgcolor=priority_bgcolor(priority),
-            padding=ft.padding.symmetric(horizontal=6, vertical=2),
-            border_radius=ft.border_radius.all(6),
+            content=ft.Text(label, size=10, weight=ft.FontWeight.W_500, color=color),
+            bgcolor=bgcolor,
+            padding=BADGE_PADDING,
+            border_radius=BADGE_RADIUS,
         )
 
     def _toast(self, text: str):
-        self.app.toast(text)
+        # вызывающий код свои изменения уже отправил — обновляем только snackbar
+        self.app.toast(text, update_page=False)
     
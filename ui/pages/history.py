@@ -1,13 +1,17 @@
 # planner/ui/pages/history.py
 from __future__ import annotations
 
+import asyncio
+import re
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Dict, List, Optional, Tuple
 
 import flet as ft
 
 from services.tasks import TaskService
 from core.priorities import (
+    DEFAULT_PRIORITY,
+    PRIORITY_META,
     priority_options,
     priority_label,
     priority_color,
@@ -15,17 +19,73 @@ from core.priorities import (
     normalize_priority,
 )
 
+# дд.мм.гггг; неполный ввод отсекаем без исключения из strptime
+_DATE_RE = re.compile(r"^\d{1,2}\.\d{1,2}\.\d{4}$")
+
+# пауза после последнего нажатия клавиши в поиске перед запросом к БД
+SEARCH_DEBOUNCE_SEC = 0.25
+# карточек за раз; следующая порция — при подходе к концу списка
+RESULTS_PAGE_SIZE = 50
+LOAD_MORE_THRESHOLD_PX = 400
+
+BADGE_PADDING = ft.padding.symmetric(horizontal=8, vertical=4)
+BADGE_RADIUS = ft.border_radius.all(8)
+NOTE_PADDING = ft.padding.only(top=8)
+
+# (момент, формат) -> строка: даты задач между поисками почти не меняются,
+# поэтому strftime на каждую карточку не нужен; старые записи вытесняем по FIFO
+_FMT_CACHE_MAX = 10_000
+_fmt_cache: Dict[tuple, str] = {}
+
+
+def _fmt(dt: datetime, fmt: str) -> str:
+    # aware-моменты с разным смещением равны, но печатаются по-разному
+    key = (dt, dt.tzinfo, fmt)
+    text = _fmt_cache.get(key)
+    if text is None:
+        text = dt.strftime(fmt)
+        if len(_fmt_cache) >= _FMT_CACHE_MAX:
+            del _fmt_cache[next(iter(_fmt_cache))]
+        _fmt_cache[key] = text
+    return text
+
+
 _STATUS_LABELS = {
     "todo": "К выполнению",
     "doing": "В работе",
     "done": "Выполнено",
 }
 
+# значения/подписи фильтров; сами Option создаются на странице
+_STATUS_CHOICES = (("all", "Любой статус"), *_STATUS_LABELS.items())
+_PRIORITY_CHOICES = (("-1", "Любой приоритет"), *priority_options().items())
+
+# приоритет -> (полная подпись, короткая, цвет, фон бейджа, фон карточки);
+# карточки строятся на каждый поиск, поэтому считаем один раз при импорте
+_PRIO_SPECS = {
+    p: (
+        priority_label(p, short=False),
+        priority_label(p, short=True),
+        priority_color(p),
+        priority_bgcolor(p),
+        ft.Colors.with_opacity(0.04, priority_color(p)) if p else "#F1F5F9",
+    )
+    for p in PRIORITY_META
+}
+
 
 class HistoryPage:
     def __init__(self, app):
         self.app = app
         self.svc = TaskService()
+        # поколение поиска: новый запрос отменяет отложенный и отбрасывает
+        # результат ещё не завершённого
+        self._search_generation = 0
+        # id задачи -> (отпечаток полей, карточка); неизменённые карточки не пересобираем
+        self._card_cache: Dict[int, Tuple[tuple, ft.Card]] = {}
+        # вся выдача последнего поиска; в списке — только первые _shown
+        self._all_tasks: List = []
+        self._shown = 0
 
         self.search_tf = ft.TextField(
             label="Поиск",
@@ -33,7 +93,7 @@ class HistoryPage:
             expand=True,
             prefix=ft.Icon(ft.Icons.SEARCH),
             on_submit=self._on_filters_changed,
-            on_change=self._on_filters_changed,
+            on_change=self._on_search_typed,
         )
 
         self.start_tf = ft.TextField(label="Дата c", width=150)
@@ -67,27 +127,19 @@ class HistoryPage:
             on_click=lambda e: self.app.page.open(self.end_picker),
         )
 
-        status_options = [
-            ft.dropdown.Option("all", "Любой статус"),
-            ft.dropdown.Option("todo", _STATUS_LABELS["todo"]),
-            ft.dropdown.Option("doing", _STATUS_LABELS["doing"]),
-            ft.dropdown.Option("done", _STATUS_LABELS["done"]),
-        ]
         self.status_dd = ft.Dropdown(
             label="Статус",
             width=180,
             value="all",
-            options=status_options,
+            options=[ft.dropdown.Option(key, label) for key, label in _STATUS_CHOICES],
             on_change=self._on_filters_changed,
         )
 
-        priority_opts = [ft.dropdown.Option(key, label) for key, label in priority_options().items()]
-        priority_opts.insert(0, ft.dropdown.Option("-1", "Любой приоритет"))
         self.priority_dd = ft.Dropdown(
             label="Приоритет",
             width=200,
             value="-1",
-            options=priority_opts,
+            options=[ft.dropdown.Option(key, label) for key, label in _PRIORITY_CHOICES],
             on_change=self._on_filters_changed,
         )
 
@@ -113,7 +165,12 @@ class HistoryPage:
         )
 
         self.result_info = ft.Text("", size=12, color="#6B7280")
-        self.result_list = ft.ListView(expand=True, spacing=8)
+        self.result_list = ft.ListView(
+            expand=True,
+            spacing=8,
+            cache_extent=LOAD_MORE_THRESHOLD_PX,
+            on_scroll=self._maybe_load_more,
+        )
 
         self.view = ft.Container(
             content=ft.Column(
@@ -141,6 +198,16 @@ class HistoryPage:
     def _on_filters_changed(self, _):
         self.run_search()
 
+    def _on_search_typed(self, _):
+        # серия нажатий сливается в один запрос после паузы
+        self._search_generation += 1
+        self.app.page.run_task(self._debounced_search, self._search_generation)
+
+    async def _debounced_search(self, generation: int) -> None:
+        await asyncio.sleep(SEARCH_DEBOUNCE_SEC)
+        if generation == self._search_generation:
+            self.run_search()
+
     def _on_reset(self, _):
         self.search_tf.value = ""
         self.start_tf.value = ""
@@ -152,38 +219,96 @@ class HistoryPage:
 
     # ---------- Data ----------
     def run_search(self):
+        self._search_generation += 1
         start_date = self._parse_date(self.start_tf.value)
         end_date = self._parse_date(self.end_tf.value)
 
         priority_value = self.priority_dd.value
         priority = None if priority_value in (None, "-1") else normalize_priority(priority_value)
 
-        tasks = self.svc.search_history(
+        # фильтры снимаем сейчас, запрос к БД — в рабочем потоке
+        params = dict(
             query=self.search_tf.value or "",
             start_date=start_date,
             end_date=end_date,
             status=self.status_dd.value,
             priority=priority,
         )
+        self.app.page.run_task(self._search_async, self._search_generation, params)
 
+    async def _search_async(self, generation: int, params: dict) -> None:
+        try:
+            tasks = await asyncio.to_thread(self.svc.search_history, **params)
+        except Exception as e:
+            print("history search:", e)
+            return
+        if generation != self._search_generation:
+            return  # пока шёл запрос, фильтры уже поменялись
         self._render_results(tasks)
         self.app.page.update()
 
     def _render_results(self, tasks: List):
-        total = len(tasks)
+        self._all_tasks = tasks
+        old_cache = self._card_cache
+        self._card_cache = {}  # карточки, выпавшие из выдачи, отпускаем
+        page = tasks[:RESULTS_PAGE_SIZE]
+        self._shown = len(page)
+        self.result_list.controls = self._cards_for(page, old_cache)
+        self._update_result_info()
+
+    def _maybe_load_more(self, e: ft.OnScrollEvent):
+        if self._shown >= len(self._all_tasks):
+            return
+        if e.pixels < e.max_scroll_extent - LOAD_MORE_THRESHOLD_PX:
+            return
+        page = self._all_tasks[self._shown:self._shown + RESULTS_PAGE_SIZE]
+        self._shown += len(page)
+        self.result_list.controls.extend(self._cards_for(page, self._card_cache))
+        self._update_result_info()
+        self.result_info.update()
+        self.result_list.update()
+
+    def _cards_for(self, tasks: List, cache: Dict[int, Tuple[tuple, ft.Card]]) -> List[ft.Card]:
+        fresh = self._card_cache
+        cards = []
+        for t in tasks:
+            sig = self._card_signature(t)
+            cached = cache.get(t.id)
+            if cached is not None and cached[0] == sig:
+                card = cached[1]
+            else:
+                card = self._task_card(t)
+            fresh[t.id] = (sig, card)
+            cards.append(card)
+        return cards
+
+    def _update_result_info(self):
+        total = len(self._all_tasks)
         if total == 0:
             self.result_info.value = "Ничего не найдено"
+        elif self._shown < total:
+            self.result_info.value = f"Показано {self._shown} из {total}"
         else:
             self.result_info.value = f"Найдено {total} задач"
 
-        self.result_list.controls.clear()
-        for t in tasks:
-            self.result_list.controls.append(self._task_card(t))
-
     # ---------- Helpers ----------
+    @staticmethod
+    def _card_signature(task) -> tuple:
+        return (
+            task.title,
+            getattr(task, "status", ""),
+            getattr(task, "priority", 0),
+            getattr(task, "start", None),
+            getattr(task, "duration_minutes", None),
+            getattr(task, "created_at", None),
+            getattr(task, "updated_at", None),
+            task.notes,
+        )
+
     def _task_card(self, task):
         title = task.title or "(без названия)"
         priority = getattr(task, "priority", 0)
+        spec = _PRIO_SPECS.get(priority) or _PRIO_SPECS[DEFAULT_PRIORITY]
         start = getattr(task, "start", None)
         created = getattr(task, "created_at", None)
         updated = getattr(task, "updated_at", None)
@@ -192,18 +317,18 @@ class HistoryPage:
         subtitle_parts: List[str] = []
         if start:
             if isinstance(start, datetime) and start.time() == datetime.min.time():
-                subtitle_parts.append(start.strftime("Начало: %d.%m.%Y"))
+                subtitle_parts.append(_fmt(start, "Начало: %d.%m.%Y"))
             else:
-                subtitle_parts.append(start.strftime("Начало: %d.%m.%Y %H:%M"))
+                subtitle_parts.append(_fmt(start, "Начало: %d.%m.%Y %H:%M"))
         if duration:
             subtitle_parts.append(f"Длительность: {duration} мин")
         status_label = _STATUS_LABELS.get(getattr(task, "status", ""), "Неизвестно")
         subtitle_parts.append(f"Статус: {status_label}")
-        subtitle_parts.append(f"Приоритет: {priority_label(priority, short=False)}")
+        subtitle_parts.append(f"Приоритет: {spec[0]}")
         if created:
-            subtitle_parts.append(f"Создано: {created.strftime('%d.%m.%Y %H:%M')}")
+            subtitle_parts.append(_fmt(created, "Создано: %d.%m.%Y %H:%M"))
         if updated and (not created or updated != created):
-            subtitle_parts.append(f"Обновлено: {updated.strftime('%d.%m.%Y %H:%M')}")
+            subtitle_parts.append(_fmt(updated, "Обновлено: %d.%m.%Y %H:%M"))
 
         note = (task.notes or "").strip()
         note_text = ft.Text(note, size=12, color="#6B7280")
@@ -211,10 +336,10 @@ class HistoryPage:
         if note:
             note_block = ft.Container(
                 content=note_text,
-                padding=ft.padding.only(top=8),
+                padding=NOTE_PADDING,
             )
 
-        badge = self._priority_badge(priority)
+        badge = self._priority_badge(priority, spec)
 
         body = ft.Column(
             [
@@ -232,29 +357,28 @@ class HistoryPage:
             spacing=4,
         )
 
-        bgcolor = ft.Colors.with_opacity(0.04, priority_color(priority)) if priority else "#F1F5F9"
-
         return ft.Card(
             content=ft.Container(
                 content=body,
                 padding=16,
-                bgcolor=bgcolor,
+                bgcolor=spec[4],
             )
         )
 
-    def _priority_badge(self, priority: int):
+    def _priority_badge(self, priority: int, spec: tuple):
         if priority <= 0:
             return ft.Container(width=0)
+        _, short, color, bgcolor, _ = spec
         return ft.Container(
             content=ft.Text(
-                priority_label(priority, short=True),
+                short,
                 size=11,
                 weight=ft.FontWeight.W_600,
-                color=priority_color(priority),
+                color=color,
             ),
-            bgcolor=priority_bgcolor(priority),
-            padding=ft.padding.symmetric(horizontal=8, vertical=4),
-            border_radius=ft.border_radius.all(8),
+            bgcolor=bgcolor,
+            padding=BADGE_PADDING,
+            border_radius=BADGE_RADIUS,
         )
 
     def _set_date(self, tf: ft.TextField, value):
@@ -269,11 +393,11 @@ class HistoryPage:
                     tf.value = datetime.strptime(v, "%d.%m.%Y").strftime("%d.%m.%Y")
                 except ValueError:
                     return
-        self.app.page.update()
+        tf.update()
 
     def _parse_date(self, text: Optional[str]) -> Optional[date]:
         text = (text or "").strip()
-        if not text:
+        if not _DATE_RE.match(text):
             return None
         try:
             dt = datetime.strptime(text, "%d.%m.%Y")
@@ -1,7 +1,21 @@
 # ui/pages/settings.py
+import asyncio
 from datetime import timezone
+from functools import lru_cache
 import flet as ft
 
+# запросы чтения лога в пределах этого окна сливаются в одно чтение файла
+LOG_READ_DEBOUNCE_SEC = 0.05
+
+
+@lru_cache(maxsize=64)
+def _format_local(value) -> str:
+    # метки pull/push меняются редко — одно и то же время не форматируем заново;
+    # astimezone() без аргумента: смещение (в т.ч. летнее время) берётся на момент value
+    if getattr(value, "tzinfo", None) is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
+
 
 class SettingsPage:
     def __init__(self, app):
@@ -36,6 +50,15 @@ class SettingsPage:
 
         self.log_view = ft.Text("", selectable=True)
 
+        # пока идёт сетевое действие, кнопки заблокированы и крутится индикатор
+        self._action_btns = (self.connect_btn, self.reset_token_btn, self.resync_btn)
+        self.busy_ring = ft.ProgressRing(width=18, height=18, stroke_width=2, visible=False)
+
+        # контролы, изменённые внутри _begin_batch/_end_batch; None — вне пакета
+        self._dirty = None
+        # поколение чтения лога: показываем только самое свежее
+        self._log_generation = 0
+
         content = ft.Column(
             controls=[
                 ft.Text("Настройки", size=24, weight=ft.FontWeight.BOLD),
@@ -44,7 +67,11 @@ class SettingsPage:
                 self.last_calendar_pull,
                 self.last_tasks_pull,
                 self.last_push,
-                ft.Row([self.connect_btn, self.reset_token_btn, self.resync_btn], spacing=12),
+                ft.Row(
+                    [self.connect_btn, self.reset_token_btn, self.resync_btn, self.busy_ring],
+                    spacing=12,
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                ),
                 ft.Column([
                     ft.Text("Лог синхронизации", size=18, weight=ft.FontWeight.W_600),
                     ft.Container(self.log_view, height=200, padding=10, bgcolor=ft.Colors.ON_SURFACE_VARIANT),
@@ -61,9 +88,25 @@ class SettingsPage:
     def _format_dt(self, value) -> str:
         if not value:
             return "—"
-        if getattr(value, "tzinfo", None) is None:
-            value = value.replace(tzinfo=timezone.utc)
-        return value.astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
+        return _format_local(value)
+
+    # ---------- пакетное обновление ----------
+    def _begin_batch(self):
+        self._dirty = []
+
+    def _set(self, ctrl: ft.Text, value: str):
+        # то же значение — контрол не трогаем и в update не отправляем
+        if ctrl.value == value:
+            return
+        ctrl.value = value
+        if self._dirty is not None:
+            self._dirty.append(ctrl)
+
+    def _end_batch(self):
+        # один update на действие и только по изменённым контролам
+        dirty, self._dirty = self._dirty, None
+        if dirty:
+            self.app.page.update(*dirty)
 
     def refresh_status(self):
         status = self.app.sync_status() or {}
@@ -72,49 +115,91 @@ class SettingsPage:
 
         calendar_id = calendar.get("calendarId") or "—"
         token_state = "да" if calendar.get("syncToken") else "нет"
-        self.status_calendar.value = f"Google Calendar: {calendar_id} (syncToken: {token_state})"
-        self.last_calendar_pull.value = (
-            "Последний pull Calendar: " + self._format_dt(calendar.get("lastPullAt"))
+        self._set(self.status_calendar, f"Google Calendar: {calendar_id} (syncToken: {token_state})")
+        self._set(
+            self.last_calendar_pull,
+            "Последний pull Calendar: " + self._format_dt(calendar.get("lastPullAt")),
         )
 
         tasklist = tasks.get("tasklist") or "—"
-        self.status_tasks.value = f"Google Tasks: {tasklist}"
+        self._set(self.status_tasks, f"Google Tasks: {tasklist}")
         updated_min = tasks.get("updatedMin")
         suffix = f" (updatedMin: {self._format_dt(updated_min)})" if updated_min else ""
-        self.last_tasks_pull.value = (
-            "Последний pull Tasks: " + self._format_dt(tasks.get("lastPullAt")) + suffix
+        self._set(
+            self.last_tasks_pull,
+            "Последний pull Tasks: " + self._format_dt(tasks.get("lastPullAt")) + suffix,
         )
-        self.last_push.value = "Последний push: " + self._format_dt(status.get("lastPushAt"))
+        self._set(self.last_push, "Последний push: " + self._format_dt(status.get("lastPushAt")))
 
-        self.log_view.value = self.app.read_sync_log()
+        self._schedule_log_read()
 
-    def connect_google(self, _):
+    def _schedule_log_read(self):
+        # файл лога растёт — читаем его в рабочем потоке, не в обработчике UI
+        self._log_generation += 1
+        self.app.page.run_task(self._read_log_async, self._log_generation)
+
+    async def _read_log_async(self, generation: int) -> None:
+        await asyncio.sleep(LOG_READ_DEBOUNCE_SEC)
+        if generation != self._log_generation:
+            return  # за паузой пришёл более свежий запрос — читать будет он
         try:
-            self.app.connect_google_services()
-            self.refresh_status()
-            self.app.toast("Google подключён")
+            text = await asyncio.to_thread(self.app.read_sync_log)
         except Exception as e:
-            self.status_calendar.value = f"Ошибка: {e}"
-            self.app.page.update()
-
-    def reset_sync_token(self, _):
+            print("sync log read:", e)
+            return
+        if generation != self._log_generation or text == self.log_view.value:
+            return
+        self.log_view.value = text
         try:
-            self.app.reset_calendar_sync()
+            self.log_view.update()
+        except Exception:
+            # страница ещё не показана — значение уйдёт с первой отрисовкой
+            pass
+
+    def _run(self, handler, *args):
+        self.app.page.run_task(handler, *args)
+
+    def _set_busy(self, busy: bool):
+        for btn in self._action_btns:
+            btn.disabled = busy
+        self.busy_ring.visible = busy
+        ctrls = (*self._action_btns, self.busy_ring)
+        if self._dirty is not None:
+            self._dirty.extend(ctrls)
+        else:
+            self.app.page.update(*ctrls)
+
+    async def _run_action(self, action, ok_text: str, error_ctrl: ft.Text, error_prefix: str):
+        # сеть (connect/resync) может идти секундами — в рабочем потоке
+        self._set_busy(True)
+        self._begin_batch()
+        try:
+            await asyncio.to_thread(action)
             self.refresh_status()
-            self.app.toast("syncToken сброшен")
         except Exception as e:
-            self.status_calendar.value = f"Ошибка сброса: {e}"
-            self.app.page.update()
+            self._set(error_ctrl, f"{error_prefix}: {e}")
+            ok_text = None
+        finally:
+            self._set_busy(False)
+            self._end_batch()
+        if ok_text:
+            # страница уже отправлена — snackbar отдельно, без полного диффа
+            self.app.toast(ok_text, update_page=False)
+
+    def connect_google(self, _):
+        self._run(self._run_action, self.app.connect_google_services, "Google подключён", self.status_calendar, "Ошибка")
+
+    def reset_sync_token(self, _):
+        self._run(self._run_action, self.app.reset_calendar_sync, "syncToken сброшен", self.status_calendar, "Ошибка сброса")
 
     def full_resync(self, _):
-        try:
-            self.app.force_full_resync()
-            self.refresh_status()
-            self.app.toast("Полная синхронизация завершена")
-        except Exception as e:
-            self.status_tasks.value = f"Ошибка: {e}"
-            self.app.page.update()
+        self._run(
+            self._run_action,
+            self.app.force_full_resync,
+            "Полная синхронизация завершена",
+            self.status_tasks,
+            "Ошибка",
+        )
 
     def refresh_log(self, _):
-        self.log_view.value = self.app.read_sync_log()
-        self.app.page.update()
+        self._schedule_log_read()
@@ -6,6 +6,22 @@ from datetime import date, datetime, time, timezone
 from typing import Optional, Union
 
 UTC = timezone.utc
+_fromisoformat = datetime.fromisoformat
+
+
+def _pad_fraction(value: str) -> str:
+    head, tail = value.split(".", 1)
+    if "+" in tail:
+        frac, tz = tail.split("+", 1)
+        sign = "+"
+    elif "-" in tail:
+        frac, tz = tail.split("-", 1)
+        sign = "-"
+    else:
+        frac, tz = tail, "+00:00"
+        sign = "+"
+    frac = (frac + "000000")[:6]
+    return f"{head}.{frac}{sign}{tz}"
 
 
 def parse_rfc3339(s: Optional[str]) -> Optional[datetime]:
@@ -21,23 +37,16 @@ def parse_rfc3339(s: Optional[str]) -> Optional[datetime]:
     if value.endswith("Z"):
         value = value[:-1] + "+00:00"
 
-    if "." in value:
-        head, tail = value.split(".", 1)
-        if "+" in tail:
-            frac, tz = tail.split("+", 1)
-            sign = "+"
-        elif "-" in tail:
-            frac, tz = tail.split("-", 1)
-            sign = "-"
-        else:
-            frac, tz = tail, "+00:00"
-            sign = "+"
-        frac = (frac + "000000")[:6]
-        value = f"{head}.{frac}{sign}{tz}"
+    # Google timestamps parse as-is; only odd fraction widths need rewriting.
     try:
-        dt = datetime.fromisoformat(value)
+        dt = _fromisoformat(value)
     except ValueError:
-        return None
+        if "." not in value:
+            return None
+        try:
+            dt = _fromisoformat(_pad_fraction(value))
+        except ValueError:
+            return None
 
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=UTC)